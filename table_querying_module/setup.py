@@ -71,6 +71,9 @@ setup(
         "redis": [
             "redis>=4.3.0",
         ],
+        "fast": [
+            "orjson>=3.6.0",
+        ],
         "all": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -88,6 +91,7 @@ setup(
             "psycopg2-binary>=2.9.0",
             "pymongo>=4.0.0",
             "redis>=4.3.0",
+            "orjson>=3.6.0",
         ]
     },
     
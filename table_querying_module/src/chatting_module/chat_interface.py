@@ -38,7 +38,8 @@ class ChatInterface:
         # Initialize components
         self.query_analyzer = QueryAnalyzer(api_key, model_id)
         self.sql_generator = SQLGenerator(api_key, model_id)
-        self.result_exporter = ResultExporter(output_dir)
+        self.output_dir = output_dir
+        self._result_exporter: Optional[ResultExporter] = None
         
         # Verify database exists
         if not Path(db_path).exists():
@@ -46,6 +47,13 @@ class ChatInterface:
         
         logger.info(f"ChatInterface initialized with database: {db_path}")
     
+    @property
+    def result_exporter(self) -> ResultExporter:
+        """Exporter for saving results, created (with its output directory) on first use."""
+        if self._result_exporter is None:
+            self._result_exporter = ResultExporter(self.output_dir)
+        return self._result_exporter
+    
     def chat(self, user_query: str) -> Union[str, str]:
         """
         Process a user query and return either SQL query or "IMPOSSIBLE".
@@ -27,6 +27,41 @@ class AnalysisResult:
 class QueryAnalyzer:
     """Analyzes user queries to determine if they can be fulfilled by table data."""
     
+    # Keywords used by the fallback analysis when the LLM response is not valid JSON
+    _POSITIVE_KEYWORDS = ("yes", "true", "fulfillable", "can be", "possible")
+    _NEGATIVE_KEYWORDS = ("no", "false", "impossible", "cannot", "not possible")
+    
+    # Invariant instructions, sent as the system message ahead of the per-query
+    # tables context and question so the provider's prompt-prefix cache can reuse them
+    _SYSTEM_PROMPT = """You are an expert database query analyst. Your task is to determine if a user's question can be answered by querying the available table data.
+
+Analyze whether the user's query can be fulfilled by querying the available tables. Consider:
+1. Does the query ask for information that could be contained in the tables?
+2. Are the required data fields likely present in the table columns?
+3. Is the query asking for data aggregation, filtering, or specific lookups that are feasible with SQL?
+
+Respond with a JSON object in this exact format:
+{
+    "is_fulfillable": true/false,
+    "confidence": 0.0-1.0,
+    "reasoning": "Detailed explanation of your analysis",
+    "suggested_approach": "How to approach this query (if fulfillable) or alternative suggestions",
+    "required_tables": ["list", "of", "table_ids", "needed"]
+}
+
+Examples of fulfillable queries:
+- "Show me all data from the inventory table"
+- "What are the different categories in the products table?"
+- "Find all entries where the price is greater than 100"
+- "Count how many items are in stock"
+
+Examples of non-fulfillable queries:
+- "What's the weather today?" (not related to table data)
+- "Generate a new table with random data" (creation, not querying)
+- "Send an email to customer support" (action outside of database)
+
+Be precise and only return the JSON object."""
+    
     def __init__(self, api_key: str, model_id: str = "gpt-3.5-turbo"):
         """
         Initialize the QueryAnalyzer.
@@ -38,6 +73,10 @@ class QueryAnalyzer:
         self.api_key = api_key
         self.model_id = model_id
         self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
         logger.info(f"QueryAnalyzer initialized with model {model_id}")
     
     def analyze_query(self, user_query: str, available_tables: List[Dict[str, Any]]) -> AnalysisResult:
@@ -110,56 +149,27 @@ class QueryAnalyzer:
         return "\n\n".join(context_parts)
     
     def _create_analysis_prompt(self, user_query: str, tables_context: str) -> str:
-        """Create the prompt for LLM analysis."""
-        return f"""You are an expert database query analyst. Your task is to determine if a user's question can be answered by querying the available table data.
-
-{tables_context}
+        """Create the per-query user prompt for LLM analysis."""
+        return f"""{tables_context}
 
 User Query: "{user_query}"
 
-Analyze whether this query can be fulfilled by querying the available tables. Consider:
-1. Does the query ask for information that could be contained in the tables?
-2. Are the required data fields likely present in the table columns?
-3. Is the query asking for data aggregation, filtering, or specific lookups that are feasible with SQL?
-
-Respond with a JSON object in this exact format:
-{{
-    "is_fulfillable": true/false,
-    "confidence": 0.0-1.0,
-    "reasoning": "Detailed explanation of your analysis",
-    "suggested_approach": "How to approach this query (if fulfillable) or alternative suggestions",
-    "required_tables": ["list", "of", "table_ids", "needed"]
-}}
-
-Examples of fulfillable queries:
-- "Show me all data from the inventory table"
-- "What are the different categories in the products table?"
-- "Find all entries where the price is greater than 100"
-- "Count how many items are in stock"
-
-Examples of non-fulfillable queries:
-- "What's the weather today?" (not related to table data)
-- "Generate a new table with random data" (creation, not querying)
-- "Send an email to customer support" (action outside of database)
-
-Be precise and only return the JSON object."""
+Analyze whether this query can be fulfilled by querying the available tables and respond with the JSON object only."""
 
     def _call_llm(self, prompt: str) -> str:
         """Make API call to LLM."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": self.model_id,
             "stream": False,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": [
+                {"role": "system", "content": self._SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
             "max_tokens": 500,
             "temperature": 0.1
         }
         
-        response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
+        response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -197,11 +207,8 @@ Be precise and only return the JSON object."""
         response_lower = response.lower()
         
         # Simple keyword-based analysis
-        positive_keywords = ["yes", "true", "fulfillable", "can be", "possible"]
-        negative_keywords = ["no", "false", "impossible", "cannot", "not possible"]
-        
-        positive_count = sum(1 for word in positive_keywords if word in response_lower)
-        negative_count = sum(1 for word in negative_keywords if word in response_lower)
+        positive_count = sum(1 for word in self._POSITIVE_KEYWORDS if word in response_lower)
+        negative_count = sum(1 for word in self._NEGATIVE_KEYWORDS if word in response_lower)
         
         is_fulfillable = positive_count > negative_count
         confidence = 0.3 if positive_count > 0 or negative_count > 0 else 0.1
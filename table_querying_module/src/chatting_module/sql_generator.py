@@ -9,7 +9,6 @@ import logging
 import requests
 import json
 import sqlite3
-import re
 from typing import Dict, Any, Optional, List, Union
 from dataclasses import dataclass
 
@@ -29,6 +28,66 @@ class SQLResult:
 class SQLGenerator:
     """Generates SQL queries from user requests with retry logic."""
     
+    # Statements accepted as the start of a generated query
+    _SQL_KEYWORDS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+    
+    # Static description of the storage schema shared by every prompt
+    _SCHEMA_OVERVIEW = (
+        "Available tables:",
+        "",
+        "1. tables (metadata about processed tables):",
+        "   - id (INTEGER PRIMARY KEY)",
+        "   - table_id (TEXT) - unique identifier for each table", 
+        "   - source_file (TEXT) - original HTML file name",
+        "   - rows (INTEGER) - number of data rows",
+        "   - columns (INTEGER) - number of columns",
+        "   - column_names (TEXT) - JSON array of column names",
+        "   - column_types (TEXT) - JSON array of column types",
+        "   - description (TEXT) - LLM-generated table description",
+        "   - created_at (TIMESTAMP)",
+        "",
+        "2. table_data (actual table row data):",
+        "   - id (INTEGER PRIMARY KEY)",
+        "   - table_id (TEXT) - references tables.table_id",
+        "   - row_index (INTEGER) - row number within table",
+        "   - row_data (TEXT) - JSON object with column names as keys",
+        "   - created_at (TIMESTAMP)",
+        "",
+        "3. processing_sessions (processing session tracking):",
+        "   - id (INTEGER PRIMARY KEY)",
+        "   - session_id (TEXT UNIQUE)",
+        "   - source_file (TEXT)",
+        "   - total_tables (INTEGER)",
+        "   - successful_tables (INTEGER)",
+        "   - created_at (TIMESTAMP)"
+    )
+    
+    # Invariant instructions, sent as the system message ahead of the per-query
+    # schema and question so the provider's prompt-prefix cache can reuse them
+    _SYSTEM_PROMPT = """You are an expert SQL query generator. Generate a SQLite-compatible SQL query to answer the user's question.
+
+Important Rules:
+1. ONLY return the SQL query, nothing else
+2. Use exact table and column names from the schema
+3. Use SQLite-compatible syntax
+4. For text searches, use LIKE with wildcards (%)
+5. For table_data.row_data (JSON object), use json_extract(row_data, '$."ColumnName"') to access fields
+6. IMPORTANT: Cast JSON values to correct types - use CAST(json_extract(...) AS INTEGER) for integers, CAST(json_extract(...) AS REAL) for numbers
+7. IMPORTANT: json_extract() returns raw values - for strings compare with 'Value', NOT '"Value"' (no extra quotes)
+8. Use proper JOIN syntax if multiple tables are needed
+9. Add appropriate WHERE clauses for filtering
+10. Use aggregation functions (COUNT, SUM, AVG, etc.) when appropriate
+
+Examples of good SQL queries:
+- SELECT * FROM tables WHERE source_file LIKE '%minecraft%';
+- SELECT COUNT(*) FROM table_data WHERE table_id = 'sample_table_1';
+- SELECT column_names, description FROM tables WHERE rows > 5;
+- SELECT row_data FROM table_data WHERE table_id = 'sample_table_1' AND json_extract(row_data, '$."Player Name"') = 'Alex';
+- SELECT AVG(CAST(json_extract(row_data, '$."Value"') AS REAL)) FROM table_data WHERE json_extract(row_data, '$."Type"') = 'Tool';
+- SELECT row_data FROM table_data WHERE CAST(json_extract(row_data, '$."Level"') AS INTEGER) > 20;
+- SELECT row_data FROM table_data WHERE CAST(json_extract(row_data, '$."Health"') AS INTEGER) = 20;
+- SELECT json_extract(row_data, '$."Player Name"') FROM table_data WHERE CAST(json_extract(row_data, '$."Level"') AS INTEGER) <= 18;"""
+    
     def __init__(self, api_key: str, model_id: str = "gpt-3.5-turbo", max_retries: int = 5):
         """
         Initialize the SQLGenerator.
@@ -42,6 +101,10 @@ class SQLGenerator:
         self.model_id = model_id
         self.max_retries = max_retries
         self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
         logger.info(f"SQLGenerator initialized with model {model_id}, max_retries={max_retries}")
     
     def generate_sql(self, user_query: str, database_schema: Dict[str, Any], 
@@ -125,7 +188,7 @@ class SQLGenerator:
             )
     
     def _create_sql_prompt(self, user_query: str, database_schema: Dict[str, Any], attempt: int) -> str:
-        """Create the prompt for SQL generation."""
+        """Create the per-query user prompt for SQL generation."""
         
         # Build database schema context
         schema_context = self._build_schema_context(database_schema)
@@ -141,37 +204,11 @@ This is attempt {attempt}. Previous attempts failed. Please:
 4. Consider case sensitivity
 """
 
-        return f"""You are an expert SQL query generator. Generate a SQLite-compatible SQL query to answer the user's question.
-
-Database Schema:
+        return f"""Database Schema:
 {schema_context}
 
 User Question: "{user_query}"
-
 {retry_guidance}
-
-Important Rules:
-1. ONLY return the SQL query, nothing else
-2. Use exact table and column names from the schema
-3. Use SQLite-compatible syntax
-4. For text searches, use LIKE with wildcards (%)
-5. For table_data.row_data (JSON object), use json_extract(row_data, '$."ColumnName"') to access fields
-6. IMPORTANT: Cast JSON values to correct types - use CAST(json_extract(...) AS INTEGER) for integers, CAST(json_extract(...) AS REAL) for numbers
-7. IMPORTANT: json_extract() returns raw values - for strings compare with 'Value', NOT '"Value"' (no extra quotes)
-8. Use proper JOIN syntax if multiple tables are needed
-9. Add appropriate WHERE clauses for filtering
-10. Use aggregation functions (COUNT, SUM, AVG, etc.) when appropriate
-
-Examples of good SQL queries:
-- SELECT * FROM tables WHERE source_file LIKE '%minecraft%';
-- SELECT COUNT(*) FROM table_data WHERE table_id = 'sample_table_1';
-- SELECT column_names, description FROM tables WHERE rows > 5;
-- SELECT row_data FROM table_data WHERE table_id = 'sample_table_1' AND json_extract(row_data, '$."Player Name"') = 'Alex';
-- SELECT AVG(CAST(json_extract(row_data, '$."Value"') AS REAL)) FROM table_data WHERE json_extract(row_data, '$."Type"') = 'Tool';
-- SELECT row_data FROM table_data WHERE CAST(json_extract(row_data, '$."Level"') AS INTEGER) > 20;
-- SELECT row_data FROM table_data WHERE CAST(json_extract(row_data, '$."Health"') AS INTEGER) = 20;
-- SELECT json_extract(row_data, '$."Player Name"') FROM table_data WHERE CAST(json_extract(row_data, '$."Level"') AS INTEGER) <= 18;
-
 Generate ONLY the SQL query (no explanations, no markdown formatting):"""
 
     def _build_schema_context(self, database_schema: Dict[str, Any]) -> str:
@@ -181,35 +218,7 @@ Generate ONLY the SQL query (no explanations, no markdown formatting):"""
         if not tables_info:
             return "No tables available."
         
-        context_parts = [
-            "Available tables:",
-            "",
-            "1. tables (metadata about processed tables):",
-            "   - id (INTEGER PRIMARY KEY)",
-            "   - table_id (TEXT) - unique identifier for each table", 
-            "   - source_file (TEXT) - original HTML file name",
-            "   - rows (INTEGER) - number of data rows",
-            "   - columns (INTEGER) - number of columns",
-            "   - column_names (TEXT) - JSON array of column names",
-            "   - column_types (TEXT) - JSON array of column types",
-            "   - description (TEXT) - LLM-generated table description",
-            "   - created_at (TIMESTAMP)",
-            "",
-            "2. table_data (actual table row data):",
-            "   - id (INTEGER PRIMARY KEY)",
-            "   - table_id (TEXT) - references tables.table_id",
-            "   - row_index (INTEGER) - row number within table",
-            "   - row_data (TEXT) - JSON object with column names as keys",
-            "   - created_at (TIMESTAMP)",
-            "",
-            "3. processing_sessions (processing session tracking):",
-            "   - id (INTEGER PRIMARY KEY)",
-            "   - session_id (TEXT UNIQUE)",
-            "   - source_file (TEXT)",
-            "   - total_tables (INTEGER)",
-            "   - successful_tables (INTEGER)",
-            "   - created_at (TIMESTAMP)"
-        ]
+        context_parts = list(self._SCHEMA_OVERVIEW)
         
         # Add specific table information if available
         if tables_info:
@@ -246,20 +255,18 @@ Generate ONLY the SQL query (no explanations, no markdown formatting):"""
     
     def _call_llm(self, prompt: str) -> str:
         """Make API call to LLM."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": self.model_id,
             "stream": False,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": [
+                {"role": "system", "content": self._SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
             "max_tokens": 200,
             "temperature": 0.0
         }
         
-        response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
+        response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -281,10 +288,7 @@ Generate ONLY the SQL query (no explanations, no markdown formatting):"""
         response = response.strip()
         
         # Basic SQL validation - should start with SELECT, INSERT, UPDATE, DELETE, etc.
-        sql_keywords = ["SELECT", "INSERT", "UPDATE", "DELETE", "WITH"]
-        response_upper = response.upper()
-        
-        if not any(response_upper.startswith(keyword) for keyword in sql_keywords):
+        if not response.upper().startswith(self._SQL_KEYWORDS):
             logger.warning(f"Response doesn't start with SQL keyword: {response[:50]}...")
             return None
         
@@ -6,11 +6,12 @@ making it easy to plug in different implementations.
 """
 
 from .llm_service import LLMService, LLMResponse
+from .async_llm_service import AsyncLLMService, ThreadedAsyncLLMService
 from .database_service import DatabaseService, TableMetadata, QueryResult
 from .service_factory import ServiceFactory, ServiceConfig
 
 __all__ = [
-    'LLMService', 'LLMResponse',
+    'LLMService', 'LLMResponse', 'AsyncLLMService', 'ThreadedAsyncLLMService',
     'DatabaseService', 'TableMetadata', 'QueryResult', 
     'ServiceFactory', 'ServiceConfig'
 ]
\ No newline at end of file
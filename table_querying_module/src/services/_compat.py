@@ -0,0 +1,90 @@
+"""
+Compatibility helpers shared by the service modules: Python version
+differences and the optional orjson dependency.
+"""
+
+import json
+import math
+import sys
+from typing import Any, Callable, Optional
+
+# orjson is optional; the stdlib json module is used when it is not installed
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    _ORJSON_AVAILABLE = False
+
+# Result and config objects are created per table/query/call; use slotted
+# dataclasses where supported (Python 3.10+) for smaller instances and faster
+# attribute access. setup.py still supports 3.8, where this is a no-op.
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Compact encoder for the common call (no sort_keys/default): no whitespace
+# between tokens, and a single reusable encoder instead of one per dumps() call.
+# allow_nan=False rejects NaN/Infinity, which are not valid JSON (SQLite's
+# json_extract and HTTP APIs cannot read them), so they are written as null
+# like orjson does
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'), allow_nan=False)
+
+
+def _replace_non_finite(obj: Any) -> Any:
+    """Copy obj with NaN and infinite floats (e.g. empty pandas cells) replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(item) for item in obj]
+    return obj
+
+
+def _json_dumps_stdlib(obj: Any, sort_keys: bool = False,
+                       default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Encode obj as compact JSON text with the stdlib, writing non-finite floats as null."""
+    if sort_keys or default is not None:
+        encoder = json.JSONEncoder(separators=(',', ':'), allow_nan=False,
+                                   sort_keys=sort_keys, default=default)
+    else:
+        encoder = _COMPACT_ENCODER
+    try:
+        return encoder.encode(obj)
+    except ValueError:
+        # Rare: only values holding NaN/Infinity take the copying path
+        return encoder.encode(_replace_non_finite(obj))
+
+
+if _ORJSON_AVAILABLE:
+    # orjson always writes compact JSON; NON_STR_KEYS keeps the stdlib's
+    # handling of int keys and SERIALIZE_NUMPY accepts numpy scalars coming
+    # straight out of pandas frames
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _json_dumpb(obj: Any, sort_keys: bool = False,
+                    default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """Encode obj as compact UTF-8 JSON bytes."""
+        option = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+        return orjson.dumps(obj, default=default, option=option)
+
+    def _json_dumps(obj: Any, sort_keys: bool = False,
+                    default: Optional[Callable[[Any], Any]] = None) -> str:
+        """Encode obj as compact JSON text."""
+        return _json_dumpb(obj, sort_keys, default).decode('utf-8')
+
+    def _json_loads(data: Any) -> Any:
+        """Parse JSON from bytes or text."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Data written by earlier versions with json.dumps may hold bare
+            # NaN/Infinity tokens, which only the stdlib parser accepts
+            return json.loads(data)
+else:
+    def _json_dumpb(obj: Any, sort_keys: bool = False,
+                    default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """Encode obj as compact UTF-8 JSON bytes."""
+        return _json_dumps_stdlib(obj, sort_keys, default).encode('utf-8')
+
+    _json_dumps = _json_dumps_stdlib
+    _json_loads = json.loads
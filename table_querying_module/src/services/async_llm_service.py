@@ -0,0 +1,138 @@
+"""
+Async LLM Service Interface.
+
+This module defines an asyncio interface for LLM services, so drivers can
+issue many requests with asyncio.gather and overlap their network wait with
+prompt building, plus an adapter that exposes any synchronous LLMService
+through it.
+"""
+
+import asyncio
+import functools
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union
+
+from .llm_service import LLMService, LLMResponse
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLLMService(ABC):
+    """Abstract base class for asyncio LLM services."""
+    
+    @abstractmethod
+    async def generate_completion(self, prompt: str, **kwargs) -> LLMResponse:
+        """
+        Generate a completion for the given prompt.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters (temperature, max_tokens, etc.)
+            
+        Returns:
+            LLMResponse with the generated content
+        """
+        pass
+    
+    @abstractmethod
+    async def generate_chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """
+        Generate a chat completion for the given messages.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            **kwargs: Additional generation parameters
+            
+        Returns:
+            LLMResponse with the generated content
+        """
+        pass
+    
+    async def generate_completions_batch(self, prompts: List[Union[str, List[Dict[str, str]]]],
+                                         **kwargs) -> List[LLMResponse]:
+        """
+        Generate completions for several prompts concurrently.
+        
+        Args:
+            prompts: Input prompts, each a string or a list of chat messages
+            **kwargs: Generation parameters applied to every prompt
+            
+        Returns:
+            LLMResponse per prompt, in input order
+        """
+        return list(await asyncio.gather(*(
+            self.generate_completion(prompt, **kwargs) if isinstance(prompt, str)
+            else self.generate_chat_completion(prompt, **kwargs)
+            for prompt in prompts
+        )))
+
+
+class ThreadedAsyncLLMService(AsyncLLMService):
+    """
+    AsyncLLMService backed by a synchronous LLMService.
+    
+    Each call runs the wrapped service on a thread pool of max_concurrency
+    workers, which also bounds the number of requests in flight. The wrapped
+    service's own features (connection pooling, response and prompt caches)
+    apply unchanged, and the convenience methods delegate to it.
+    """
+    
+    def __init__(self, service: LLMService, max_concurrency: Optional[int] = None):
+        """
+        Wrap a synchronous LLM service.
+        
+        Args:
+            service: Service to run; must be safe to call from several threads
+            max_concurrency: Maximum concurrent requests (default: the service's
+                max_concurrency config value, or 10)
+        """
+        self.service = service
+        self.max_concurrency = max_concurrency or service.config.get('max_concurrency', 10)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="llm"
+        )
+    
+    async def _run(self, method, *args, **kwargs):
+        """Run a blocking service method on the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+    
+    async def generate_completion(self, prompt: str, **kwargs) -> LLMResponse:
+        """Generate a completion on a worker thread."""
+        return await self._run(self.service.generate_completion, prompt, **kwargs)
+    
+    async def generate_chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """Generate a chat completion on a worker thread."""
+        return await self._run(self.service.generate_chat_completion, messages, **kwargs)
+    
+    async def is_available(self) -> bool:
+        """Check if the wrapped service is available."""
+        return await self._run(self.service.is_available)
+    
+    async def generate_table_description(self, schema: Dict[str, Any], context_hint: str = "") -> LLMResponse:
+        """Generate a table description; see LLMService.generate_table_description."""
+        return await self._run(self.service.generate_table_description, schema, context_hint)
+    
+    async def generate_sql_query(self, user_query: str, database_schema: Dict[str, Any]) -> LLMResponse:
+        """Generate SQL from natural language; see LLMService.generate_sql_query."""
+        return await self._run(self.service.generate_sql_query, user_query, database_schema)
+    
+    async def analyze_query_feasibility(self, user_query: str,
+                                        available_tables: List[Dict[str, Any]]) -> LLMResponse:
+        """Analyze query feasibility; see LLMService.analyze_query_feasibility."""
+        return await self._run(self.service.analyze_query_feasibility, user_query, available_tables)
+    
+    def close(self, wait: bool = True) -> None:
+        """
+        Shut down the worker threads.
+        
+        Requests already submitted still run to completion either way; the
+        wrapped service is left open and remains the caller's to close.
+        
+        Args:
+            wait: Block until in-flight requests have finished; with False
+                this returns immediately and they finish in the background
+        """
+        self._executor.shutdown(wait=wait)
@@ -7,11 +7,18 @@ plug in different database providers (SQLite, PostgreSQL, MongoDB, etc.).
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Iterator
 from datetime import datetime
 
+from ._compat import _DATACLASS_OPTIONS
 
-@dataclass
+# Keys every table_data dict must carry to be stored
+_REQUIRED_TABLE_FIELDS = frozenset(
+    ['table_id', 'source_file', 'rows', 'columns', 'column_names', 'row_data']
+)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TableMetadata:
     """Standard metadata format for stored tables."""
     table_id: str
@@ -33,11 +40,13 @@ class TableMetadata:
             'column_names': self.column_names,
             'column_types': self.column_types,
             'description': self.description,
-            'created_at': self.created_at
+            # ISO string, matching how created_at is reported elsewhere and
+            # keeping the dict directly JSON-serializable
+            'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class QueryResult:
     """Standard result format for database queries."""
     success: bool
@@ -285,6 +294,21 @@ class DatabaseService(ABC):
     
     # Utility Methods
     
+    def iter_table_schemas(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield schema information one table at a time.
+        
+        Lets callers that write schemas out incrementally (e.g. into an LLM
+        prompt or a file) avoid building a dictionary for every table up front.
+        The default implementation still loads all metadata through
+        get_all_tables; backends that can read from a cursor should override it.
+        
+        Yields:
+            Dictionary with a single table's metadata
+        """
+        for table in self.get_all_tables():
+            yield table.to_dict()
+    
     def get_database_schema(self) -> Dict[str, Any]:
         """
         Get database schema information for LLM context.
@@ -293,13 +317,29 @@ class DatabaseService(ABC):
         Returns:
             Dictionary with schema information
         """
-        tables = self.get_all_tables()
+        tables = list(self.iter_table_schemas())
         return {
-            'tables': [table.to_dict() for table in tables],
+            'tables': tables,
             'total_tables': len(tables),
             'summary': self.get_database_summary()
         }
     
+    def get_tables_with_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get metadata for every table together with its stored row count.
+        
+        The default implementation loads each table's rows; backends that can
+        aggregate in one query should override it.
+        
+        Returns:
+            List of table metadata dictionaries, each with a 'stored_rows' count
+        """
+        tables = []
+        for table in self.get_all_tables():
+            result = self.get_table_data(table.table_id)
+            tables.append({**table.to_dict(), 'stored_rows': len(result.data) if result.success else 0})
+        return tables
+    
     def validate_table_data(self, table_data: Dict[str, Any]) -> bool:
         """
         Validate table data format before storage.
@@ -310,5 +350,4 @@ class DatabaseService(ABC):
         Returns:
             True if data is valid, False otherwise
         """
-        required_fields = ['table_id', 'source_file', 'rows', 'columns', 'column_names', 'row_data']
-        return all(field in table_data for field in required_fields)
\ No newline at end of file
+        return _REQUIRED_TABLE_FIELDS.issubset(table_data)
\ No newline at end of file
@@ -6,14 +6,23 @@ for OpenAI's API (compatible with OpenAI, Azure OpenAI, and other OpenAI-compati
 """
 
 import logging
+import hashlib
+import random
+import threading
+import time
 import requests
-import json
-from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Union
 
-from ..llm_service import LLMService, LLMResponse
+from .._compat import _json_dumpb, _json_loads
+from ..llm_service import LLMService, LLMResponse, coalesce_stream
 
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying: rate limiting and transient server errors
+_RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
 
 class OpenAILLMService(LLMService):
     """OpenAI API implementation of the LLM service."""
@@ -35,6 +44,54 @@ class OpenAILLMService(LLMService):
         self.timeout = kwargs.get('timeout', 30)
         self.organization = kwargs.get('organization')  # Optional for OpenAI
         
+        # Persistent session so consecutive requests reuse the same keep-alive
+        # connection instead of paying a TCP/TLS handshake per call. Request
+        # headers and endpoint are fixed per instance, so set them once.
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+        if self.organization:
+            self._session.headers["OpenAI-Organization"] = self.organization
+        self._chat_url = f"{self.base_url}/chat/completions"
+        
+        # Keep enough pooled connections for generate_chat_completion_many;
+        # requests' default of 10 would drop the extra keep-alive connections
+        self.max_connections = kwargs.get('max_connections', 16)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        
+        # Exact-match LRU cache for deterministic (temperature <= 0) requests,
+        # guarded by a lock since completions may run on worker threads. When
+        # the base class's prompt cache is active it already answers repeats
+        # of the convenience methods, so this layer is off unless cache_size
+        # is given explicitly
+        self.cache_size = kwargs.get('cache_size', 0 if self._caching_enabled() else 128)
+        self._response_cache: "OrderedDict[str, LLMResponse]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Streamed deltas are merged and yielded at most this often (seconds)
+        self.stream_flush_interval = kwargs.get('stream_flush_interval', 0.1)
+        
+        # Route generate_completions_batch through the Batch API (half price,
+        # but results can take up to the 24h completion window)
+        self.use_batch_api = kwargs.get('use_batch_api', False)
+        self.batch_max_wait = kwargs.get('batch_max_wait')
+        
+        # Rate-limited (429) and transient failures are retried up to
+        # max_retries times with capped, fully jittered exponential backoff
+        self.max_retries = kwargs.get('max_retries', 3)
+        self.retry_base_delay = kwargs.get('retry_base_delay', 1.0)
+        self.retry_max_delay = kwargs.get('retry_max_delay', 30.0)
+        
+        # (checked_at, result) of the last is_available() probe
+        self.availability_ttl = kwargs.get('availability_ttl', 60.0)
+        self._availability: Optional[tuple] = None
+        
         logger.info(f"OpenAILLMService initialized with model {model_id}")
     
     def generate_completion(self, prompt: str, **kwargs) -> LLMResponse:
@@ -45,52 +102,43 @@ class OpenAILLMService(LLMService):
     def generate_chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
         """Generate chat completion using OpenAI API."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Add organization header if provided
-            if self.organization:
-                headers["OpenAI-Organization"] = self.organization
-            
-            payload = {
-                "model": self.model_id,
-                "messages": messages,
-                "max_tokens": kwargs.get('max_tokens', 500),
-                "temperature": kwargs.get('temperature', 0.1)
-            }
+            payload = self._build_payload(messages, **kwargs)
             
-            # Add any additional parameters
-            for key, value in kwargs.items():
-                if key not in ['max_tokens', 'temperature']:
-                    payload[key] = value
+            # Deterministic requests return the same completion for the same
+            # payload, so identical repeats are served from the cache (a
+            # temperature of None leaves sampling to the API's default)
+            temperature = payload.get("temperature")
+            cache_key = None
+            if (self.cache_size > 0 and isinstance(temperature, (int, float))
+                    and temperature <= 0):
+                cache_key = hashlib.sha256(_json_dumpb(payload, sort_keys=True)).hexdigest()
+                with self._cache_lock:
+                    cached = self._response_cache.get(cache_key)
+                    if cached is not None:
+                        self._response_cache.move_to_end(cache_key)
+                        self.cache_hits += 1
+                    else:
+                        self.cache_misses += 1
+                if cached is not None:
+                    return LLMResponse(
+                        content=cached.content,
+                        success=True,
+                        metadata={**cached.metadata, "cached": True}
+                    )
             
-            url = f"{self.base_url}/chat/completions"
-            response = requests.post(url, headers=headers, json=payload, timeout=self.timeout)
+            # Pre-serialized body; the session already sends the JSON Content-Type
+            response = self._post_with_retry(self._chat_url, data=_json_dumpb(payload))
             response.raise_for_status()
             
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+            llm_response = self._parse_completion(_json_loads(response.content))
             
-            if not content:
-                return LLMResponse(
-                    content="",
-                    success=False,
-                    error="Empty response from API",
-                    metadata={"response": result}
-                )
+            if cache_key is not None and llm_response.success:
+                with self._cache_lock:
+                    self._response_cache[cache_key] = llm_response
+                    if len(self._response_cache) > self.cache_size:
+                        self._response_cache.popitem(last=False)
             
-            return LLMResponse(
-                content=content,
-                success=True,
-                metadata={
-                    "model": self.model_id,
-                    "usage": result.get("usage", {}),
-                    "response_id": result.get("id", ""),
-                    "finish_reason": result.get("choices", [{}])[0].get("finish_reason", "")
-                }
-            )
+            return llm_response
             
         except requests.exceptions.RequestException as e:
             logger.error(f"OpenAI API request failed: {e}")
@@ -107,14 +155,330 @@ class OpenAILLMService(LLMService):
                 error=f"Unexpected error: {str(e)}"
             )
     
+    def _post_with_retry(self, url: str, idempotent: bool = True, **kwargs) -> requests.Response:
+        """
+        POST to the API, retrying rate-limited and transient failures.
+        
+        Each retry sleeps a random delay up to base * 2**attempt (capped at
+        retry_max_delay), or the server's Retry-After when that is longer, so
+        concurrent workers hitting the same limit do not retry in lockstep.
+        Only the calling thread waits; other in-flight requests continue.
+        Used for every POST: chat completions, the streaming request (before
+        any chunk is read) and the Batch API upload and submission.
+        
+        A read timeout means the server may already have acted on the request,
+        so non-idempotent calls (creating files and batches) only retry
+        failures to connect, never a timeout while awaiting the response.
+        
+        Args:
+            url: Endpoint URL
+            idempotent: Whether repeating the request is harmless; if False,
+                read timeouts are raised instead of retried
+            **kwargs: Arguments for requests.Session.post
+            
+        Returns:
+            The last response; connection errors on the final attempt are raised
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        max_retries = max(0, self.max_retries)
+        # ConnectTimeout is a ConnectionError, ReadTimeout is not
+        retryable_errors = (
+            (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            if idempotent else requests.exceptions.ConnectionError
+        )
+        
+        for attempt in range(max_retries + 1):
+            retry_after = None
+            try:
+                response = self._session.post(url, **kwargs)
+            except retryable_errors:
+                if attempt >= max_retries:
+                    raise
+            else:
+                if response.status_code not in _RETRY_STATUS_CODES or attempt >= max_retries:
+                    return response
+                retry_after = self._retry_after_seconds(response)
+                response.close()
+            
+            delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.retry_max_delay))
+            logger.warning(f"OpenAI request failed, retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+    
+    @staticmethod
+    def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+        """Parse a Retry-After header given in seconds, if present."""
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+    
+    def generate_chat_completion_stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Stream a chat completion from the OpenAI API as server-sent events."""
+        return coalesce_stream(self._stream_deltas(messages, **kwargs), self.stream_flush_interval)
+    
+    def _stream_deltas(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """Yield the content delta of every streamed chunk."""
+        payload = self._build_payload(messages, **kwargs)
+        payload["stream"] = True
+        
+        try:
+            with self._post_with_retry(self._chat_url, data=_json_dumpb(payload), stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    # Keep reading past [DONE] to the end of the body so the
+                    # connection goes back to the pool
+                    if data == b"[DONE]":
+                        continue
+                    choices = _json_loads(data).get("choices") or [{}]
+                    yield choices[0].get("delta", {}).get("content") or ""
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"OpenAI streaming request failed: {e}")
+            raise RuntimeError(f"API request failed: {e}") from e
+    
+    def _build_payload(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Build the chat completions request body."""
+        payload = {
+            "model": self.model_id,
+            "messages": messages,
+            "max_tokens": kwargs.get('max_tokens', 500),
+            "temperature": kwargs.get('temperature', 0.1)
+        }
+        
+        # Add any additional parameters
+        for key, value in kwargs.items():
+            if key not in ['max_tokens', 'temperature']:
+                payload[key] = value
+        
+        return payload
+    
+    def _parse_completion(self, result: Dict[str, Any]) -> LLMResponse:
+        """Convert a chat completions response body into an LLMResponse."""
+        content = result.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+        
+        if not content:
+            return LLMResponse(
+                content="",
+                success=False,
+                error="Empty response from API",
+                metadata={"response": result}
+            )
+        
+        return LLMResponse(
+            content=content,
+            success=True,
+            metadata={
+                "model": self.model_id,
+                "usage": result.get("usage", {}),
+                "response_id": result.get("id", ""),
+                "finish_reason": result.get("choices", [{}])[0].get("finish_reason", "")
+            }
+        )
+    
+    def generate_completions_batch(self, prompts: List[Union[str, List[Dict[str, str]]]],
+                                   **kwargs) -> List[LLMResponse]:
+        """
+        Generate completions for several prompts.
+        
+        With use_batch_api enabled the prompts are submitted as one Batch API
+        job and this call waits for it (up to batch_max_wait seconds);
+        otherwise requests are sent concurrently as in the base class.
+        """
+        if not self.use_batch_api or not prompts:
+            return super().generate_completions_batch(prompts, **kwargs)
+        
+        batch_id = self.submit_batch(prompts, **kwargs)
+        results = self.wait_for_batch(batch_id, max_wait=self.batch_max_wait) if batch_id else []
+        if len(results) != len(prompts):
+            return [
+                LLMResponse(content="", success=False, error="Batch request failed")
+                for _ in prompts
+            ]
+        return results
+    
+    def submit_batch(self, prompts: List[Union[str, List[Dict[str, str]]]], **kwargs) -> Optional[str]:
+        """
+        Submit prompts to the OpenAI Batch API for asynchronous processing.
+        
+        Batch requests are billed at a discount and have separate rate limits,
+        at the cost of completing within a 24 hour window rather than
+        immediately. Suited to offline work such as describing every table in
+        a corpus.
+        
+        Args:
+            prompts: Prompts to complete, one request per prompt; each is a
+                string or a list of chat messages
+            **kwargs: Generation parameters applied to every request
+            
+        Returns:
+            Batch identifier to pass to wait_for_batch, or None on failure
+        """
+        if not prompts:
+            return None
+        
+        lines = []
+        for index, prompt in enumerate(prompts):
+            messages = [{"role": "user", "content": prompt}] if isinstance(prompt, str) else prompt
+            lines.append(_json_dumpb({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_payload(messages, **kwargs)
+            }))
+        
+        try:
+            # Multipart upload: drop the session's JSON Content-Type so requests
+            # can set the multipart boundary header
+            upload = self._post_with_retry(
+                f"{self.base_url}/files",
+                idempotent=False,
+                headers={"Content-Type": None},
+                data={"purpose": "batch"},
+                files={"file": ("batch.jsonl", b"\n".join(lines), "application/jsonl")}
+            )
+            upload.raise_for_status()
+            
+            batch = self._post_with_retry(
+                f"{self.base_url}/batches",
+                idempotent=False,
+                json={
+                    "input_file_id": upload.json()["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h"
+                }
+            )
+            batch.raise_for_status()
+            
+            batch_id = batch.json()["id"]
+            logger.info(f"Submitted batch {batch_id} with {len(prompts)} requests")
+            return batch_id
+            
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            logger.error(f"Failed to submit OpenAI batch: {e}")
+            return None
+    
+    def wait_for_batch(self, batch_id: str, poll_interval: float = 5.0,
+                       max_poll_interval: float = 60.0,
+                       max_wait: Optional[float] = None) -> List[LLMResponse]:
+        """
+        Wait for a batch submitted with submit_batch and collect its results.
+        
+        Args:
+            batch_id: Identifier returned by submit_batch
+            poll_interval: Initial delay between status checks in seconds
+            max_poll_interval: Upper bound for the exponentially growing delay
+            max_wait: Give up after this many seconds and cancel the batch
+                (None waits indefinitely)
+            
+        Returns:
+            LLMResponse per submitted prompt, in submission order; requests the
+            batch did not complete (including those left over when the batch
+            expired) are returned as failed responses. Empty list if the batch
+            failed, was cancelled, timed out or could not be read.
+        """
+        batch_url = f"{self.base_url}/batches/{batch_id}"
+        deadline = time.monotonic() + max_wait if max_wait is not None else None
+        delay = poll_interval
+        
+        try:
+            while True:
+                response = self._session.get(batch_url, timeout=self.timeout)
+                response.raise_for_status()
+                batch = response.json()
+                status = batch.get("status")
+                
+                if status == "completed":
+                    break
+                if status == "expired":
+                    # Requests finished before the completion window closed
+                    # are still in the output file
+                    logger.warning(f"Batch {batch_id} expired, collecting partial results")
+                    break
+                if status in ("failed", "cancelled", "cancelling"):
+                    logger.error(f"Batch {batch_id} ended with status {status}")
+                    return []
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    logger.error(f"Timed out waiting for batch {batch_id} (status {status})")
+                    self._cancel_batch(batch_id)
+                    return []
+                
+                time.sleep(delay)
+                delay = min(delay * 2, max_poll_interval)
+            
+            total = batch.get("request_counts", {}).get("total", 0)
+            results: List[Optional[LLMResponse]] = [None] * total
+            
+            output_file_id = batch.get("output_file_id")
+            if output_file_id:
+                output = self._session.get(
+                    f"{self.base_url}/files/{output_file_id}/content", timeout=self.timeout
+                )
+                output.raise_for_status()
+                
+                for line in output.text.splitlines():
+                    if not line.strip():
+                        continue
+                    record = _json_loads(line)
+                    index = int(record["custom_id"])
+                    if index >= total:
+                        results.extend([None] * (index + 1 - total))
+                        total = index + 1
+                    
+                    body = (record.get("response") or {}).get("body") or {}
+                    if record.get("error") or "choices" not in body:
+                        error = record.get("error") or body.get("error") or "No completion returned"
+                        results[index] = LLMResponse(content="", success=False, error=str(error))
+                    else:
+                        results[index] = self._parse_completion(body)
+            
+            return [
+                result if result is not None
+                else LLMResponse(content="", success=False, error="Request not completed in batch")
+                for result in results
+            ]
+            
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            logger.error(f"Failed to collect results for batch {batch_id}: {e}")
+            return []
+    
+    def _cancel_batch(self, batch_id: str) -> None:
+        """Cancel a batch nobody is waiting for, so its remaining requests are not billed."""
+        try:
+            response = self._session.post(f"{self.base_url}/batches/{batch_id}/cancel",
+                                          timeout=self.timeout)
+            response.raise_for_status()
+            logger.info(f"Cancelled batch {batch_id}")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Failed to cancel batch {batch_id}: {e}")
+    
     def is_available(self) -> bool:
         """Check if OpenAI service is available."""
         if not self.api_key:
             return False
         
+        # Reuse a recent answer rather than probing the API on every check
+        now = time.monotonic()
+        if self._availability is not None and now - self._availability[0] < self.availability_ttl:
+            return self._availability[1]
+        
         try:
-            # Test with a minimal request
-            test_response = self.generate_completion("test", max_tokens=1, temperature=0)
-            return test_response.success
-        except Exception:
-            return False
\ No newline at end of file
+            # Listing models authenticates the key without spending tokens
+            response = self._session.get(f"{self.base_url}/models", timeout=self.timeout)
+            available = response.status_code == 200
+        except requests.exceptions.RequestException:
+            available = False
+        
+        self._availability = (now, available)
+        return available
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self._session.close()
@@ -5,22 +5,138 @@ This module provides a concrete implementation of the database service interface
 for SQLite databases.
 """
 
+import os
 import logging
+import hashlib
+import functools
 import sqlite3
+import threading
 import json
 import uuid
+import weakref
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator
 from pathlib import Path
 
+from .._compat import _json_dumps, _json_loads
 from ..database_service import DatabaseService, TableMetadata, QueryResult
 
 logger = logging.getLogger(__name__)
 
+# Column list shared by every query that builds TableMetadata (see
+# _row_to_metadata), so the statements differ only in their WHERE/ORDER BY
+_SELECT_TABLE_METADATA = (
+    "SELECT table_id, source_file, rows, columns, column_names, column_types, "
+    "description, created_at FROM tables"
+)
+
+# Metadata columns plus the number of stored rows per table, aggregated in a
+# single pass; the first eight columns line up with _SELECT_TABLE_METADATA
+_SELECT_TABLES_WITH_STATS = (
+    "SELECT t.table_id, t.source_file, t.rows, t.columns, t.column_names, t.column_types, "
+    "t.description, t.created_at, COUNT(td.id) "
+    "FROM tables t LEFT JOIN table_data td ON td.table_id = t.table_id "
+    "GROUP BY t.id ORDER BY t.created_at DESC"
+)
+
+# Statements used on every call are kept as module constants so each method
+# passes the identical string and always hits the connection's statement cache
+_SELECT_METADATA_BY_ID = f"{_SELECT_TABLE_METADATA} WHERE table_id = ?"
+_SELECT_METADATA_BY_SOURCE = f"{_SELECT_TABLE_METADATA} WHERE source_file = ?"
+_SELECT_ALL_METADATA = f"{_SELECT_TABLE_METADATA} ORDER BY created_at DESC"
+_SEARCH_METADATA_FTS = (
+    f"{_SELECT_TABLE_METADATA} WHERE id IN "
+    "(SELECT rowid FROM tables_fts WHERE tables_fts MATCH ?) ORDER BY created_at DESC"
+)
+_SELECT_TABLE_EXISTS = "SELECT 1 FROM tables WHERE table_id = ?"
+_SELECT_CONTENT_HASH = "SELECT content_hash FROM tables WHERE table_id = ?"
+_UPSERT_TABLE = """
+    INSERT INTO tables
+    (table_id, source_file, rows, columns, column_names, column_types, description, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(table_id) DO UPDATE SET
+        source_file = excluded.source_file,
+        rows = excluded.rows,
+        columns = excluded.columns,
+        column_names = excluded.column_names,
+        column_types = excluded.column_types,
+        description = excluded.description,
+        content_hash = excluded.content_hash,
+        created_at = CURRENT_TIMESTAMP
+"""
+_INSERT_ROW = "INSERT INTO table_data (table_id, row_index, row_data) VALUES (?, ?, ?)"
+_DELETE_TABLE_ROWS = "DELETE FROM table_data WHERE table_id = ?"
+_SELECT_TABLE_ROWS = "SELECT row_index, row_data FROM table_data WHERE table_id = ? ORDER BY row_index"
+# LIMIT -1 means no limit; SQLite only accepts OFFSET after a LIMIT
+_SELECT_TABLE_ROWS_PAGE = f"{_SELECT_TABLE_ROWS} LIMIT ? OFFSET ?"
+_INSERT_SESSION = "INSERT INTO processing_sessions (session_id, source_file) VALUES (?, ?)"
+_UPDATE_SESSION = (
+    "UPDATE processing_sessions SET total_tables = ?, successful_tables = ? WHERE session_id = ?"
+)
+_SELECT_SESSION = (
+    "SELECT session_id, source_file, total_tables, successful_tables, created_at "
+    "FROM processing_sessions WHERE session_id = ?"
+)
+_SELECT_STATS = "SELECT key, value FROM stats"
+_COUNT_TABLE_ROWS = "SELECT COUNT(*) FROM table_data"
+_SCHEMA_TABLE_EXISTS = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+
+
+@functools.lru_cache(maxsize=8)
+def _multi_row_insert_sql(row_count: int) -> str:
+    """Build an INSERT into table_data with row_count VALUES tuples."""
+    values = ", ".join(["(?, ?, ?)"] * row_count)
+    return f"INSERT INTO table_data (table_id, row_index, row_data) VALUES {values}"
+
+
+class _ThreadConnection:
+    """
+    One thread's database connection.
+    
+    Held only by the thread's threading.local, so it is released, and the
+    connection closed, as soon as the thread exits.
+    """
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+    
+    def __del__(self):
+        self.conn.close()
+
 
 class SQLiteDatabaseService(DatabaseService):
     """SQLite implementation of the database service."""
     
+    # Per-connection settings applied to every connection the service opens.
+    # synchronous=NORMAL is durable under WAL (set once in initialize) while
+    # avoiding an fsync per commit; the rest keep temp data and hot pages in memory.
+    _CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+    )
+    
+    # Prepared statements kept per connection (sqlite3 default is 128); the
+    # service issues a fixed set of statements plus multi-row INSERT variants
+    _CACHED_STATEMENTS = 256
+    
+    # Rows fetched from SQLite per batch when streaming table data
+    _FETCH_ARRAYSIZE = 1000
+    
+    # Tables with more rows than this are inserted with multi-row INSERTs of
+    # _INSERT_CHUNK_ROWS rows (3 parameters each, well under SQLite's limit)
+    _BULK_INSERT_THRESHOLD = 1000
+    _INSERT_CHUNK_ROWS = 100
+    
+    # Backups copy this many pages per step, releasing the source between
+    # steps so other connections can read and write; progress is logged
+    # every _BACKUP_LOG_STEPS steps
+    _BACKUP_PAGES = 100
+    _BACKUP_SLEEP = 0.050
+    _BACKUP_LOG_STEPS = 100
+    
     def __init__(self, db_path: str, **kwargs):
         """
         Initialize SQLite database service.
@@ -34,60 +150,107 @@ class SQLiteDatabaseService(DatabaseService):
         self.auto_commit = kwargs.get('auto_commit', True)
         self.timeout = kwargs.get('timeout', 30.0)
         
+        # Per-thread persistent connections, see _get_connection(); the set
+        # only references the holders weakly so exited threads do not pin them
+        self._local = threading.local()
+        self._connections: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        
+        # None until initialize() or the first search checks for the FTS5 index
+        self._fts_enabled: Optional[bool] = None
+        
+        # Cached get_database_summary() result and the file fingerprint it was
+        # computed against; cleared by every write made through this service
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        self._summary_fingerprint: Optional[tuple] = None
+        
         # Ensure directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
         logger.info(f"SQLiteDatabaseService initialized with database: {db_path}")
     
+    def _insert_row_data(self, cursor: sqlite3.Cursor, table_id: str, rows: List[str]) -> None:
+        """
+        Insert a table's rows into table_data.
+        
+        Small tables go through executemany on a single prepared statement.
+        Large ones are written _INSERT_CHUNK_ROWS rows per INSERT statement,
+        which cuts the per-statement overhead that dominates bulk loads.
+        
+        Args:
+            cursor: Cursor of the transaction to insert in
+            table_id: Table the rows belong to
+            rows: JSON-encoded rows in row order
+        """
+        if len(rows) <= self._BULK_INSERT_THRESHOLD:
+            cursor.executemany(
+                _INSERT_ROW,
+                ((table_id, row_index, row) for row_index, row in enumerate(rows))
+            )
+            return
+        
+        chunk_rows = self._INSERT_CHUNK_ROWS
+        chunk_sql = _multi_row_insert_sql(chunk_rows)
+        for start in range(0, len(rows), chunk_rows):
+            chunk = rows[start:start + chunk_rows]
+            params = []
+            for row_index, row in enumerate(chunk, start):
+                params.extend((table_id, row_index, row))
+            
+            # The final chunk may be short and needs its own statement
+            sql = chunk_sql if len(chunk) == chunk_rows else _multi_row_insert_sql(len(chunk))
+            cursor.execute(sql, params)
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection to the database, opening it on first use.
+        
+        Connections are kept for the lifetime of the thread (or until close())
+        so calls skip the file open and pragma setup and reuse the connection's
+        statement cache. A connection is closed when its thread exits, so
+        short-lived threads do not accumulate open files.
+        Callers use it as ``with self._get_connection() as conn:``, which
+        commits or rolls back the transaction without closing the connection.
+        """
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            # check_same_thread=False only so close() and the holder's
+            # finalizer may run from any thread; each thread still uses its
+            # own connection
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                check_same_thread=False,
+                cached_statements=self._CACHED_STATEMENTS
+            )
+            for pragma in self._CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            holder = _ThreadConnection(conn)
+            self._local.holder = holder
+            with self._connections_lock:
+                self._connections.add(holder)
+        return holder.conn
+    
+    def close(self) -> None:
+        """Close every open connection opened by this service."""
+        with self._connections_lock:
+            holders = list(self._connections)
+            self._connections = weakref.WeakSet()
+        for holder in holders:
+            holder.conn.close()
+        self._local = threading.local()
+    
     def initialize(self) -> bool:
         """Initialize SQLite database with required schema."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Create tables table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS tables (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        table_id TEXT UNIQUE NOT NULL,
-                        source_file TEXT NOT NULL,
-                        rows INTEGER NOT NULL,
-                        columns INTEGER NOT NULL,
-                        column_names TEXT NOT NULL,
-                        column_types TEXT NOT NULL,
-                        description TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Create table_data table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS table_data (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        table_id TEXT NOT NULL,
-                        row_index INTEGER NOT NULL,
-                        row_data TEXT NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (table_id) REFERENCES tables (table_id)
-                    )
-                """)
-                
-                # Create processing_sessions table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS processing_sessions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_id TEXT UNIQUE NOT NULL,
-                        source_file TEXT NOT NULL,
-                        total_tables INTEGER DEFAULT 0,
-                        successful_tables INTEGER DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
+                # Write-ahead logging lets readers run alongside a writer and
+                # turns commits into appends; the mode persists in the file
+                cursor.execute("PRAGMA journal_mode=WAL")
                 
-                # Create indexes for better performance
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tables_source_file ON tables(source_file)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_table_data_table_id ON table_data(table_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_source_file ON processing_sessions(source_file)")
+                self._fts_enabled = self._ensure_schema(cursor)
                 
                 if self.auto_commit:
                     conn.commit()
@@ -99,12 +262,79 @@ class SQLiteDatabaseService(DatabaseService):
             logger.error(f"Failed to initialize SQLite database: {e}")
             return False
     
+    def _ensure_schema(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Create missing tables, indexes, counters and the search index, and
+        migrate databases written by older versions of this service.
+        
+        Idempotent; run on initialize() and after restoring a backup, which may
+        predate any of these steps.
+        
+        Returns:
+            True if the FTS5 search index is usable
+        """
+        # Create tables table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tables (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_id TEXT UNIQUE NOT NULL,
+                source_file TEXT NOT NULL,
+                rows INTEGER NOT NULL,
+                columns INTEGER NOT NULL,
+                column_names TEXT NOT NULL,
+                column_types TEXT NOT NULL,
+                description TEXT,
+                content_hash TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Databases created before content_hash existed get the column added
+        existing_columns = {row[1] for row in cursor.execute("PRAGMA table_info(tables)")}
+        if 'content_hash' not in existing_columns:
+            cursor.execute("ALTER TABLE tables ADD COLUMN content_hash TEXT")
+        
+        # Create table_data table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS table_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_id TEXT NOT NULL,
+                row_index INTEGER NOT NULL,
+                row_data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (table_id) REFERENCES tables (table_id)
+            )
+        """)
+        
+        # Create processing_sessions table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS processing_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT UNIQUE NOT NULL,
+                source_file TEXT NOT NULL,
+                total_tables INTEGER DEFAULT 0,
+                successful_tables INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Create indexes for better performance
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tables_source_file ON tables(source_file)")
+        # (table_id, row_index) serves both per-table lookups and the
+        # ordered row scan in iter_table_rows without a sort step; it
+        # supersedes the older single-column table_id index
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_table_data_table_row ON table_data(table_id, row_index)")
+        cursor.execute("DROP INDEX IF EXISTS idx_table_data_table_id")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_source_file ON processing_sessions(source_file)")
+        
+        self._create_stats_counters(cursor)
+        return self._create_search_index(cursor)
+    
     def is_available(self) -> bool:
         """Check if SQLite database is available."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1")
+            with self._get_connection() as conn:
+                conn.execute("SELECT 1")
                 return True
         except Exception:
             return False
@@ -116,42 +346,43 @@ class SQLiteDatabaseService(DatabaseService):
             return False
         
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
+            table_id = table_data['table_id']
+            
+            # Encode rows once; the encoded form is both hashed and stored
+            encoded_rows = [_json_dumps(row) for row in table_data['row_data']]
+            content_hash = hashlib.sha256()
+            for row in encoded_rows:
+                content_hash.update(row.encode('utf-8'))
+                content_hash.update(b'\n')
+            content_hash = content_hash.hexdigest()
+            
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Insert table metadata
-                cursor.execute("""
-                    INSERT OR REPLACE INTO tables 
-                    (table_id, source_file, rows, columns, column_names, column_types, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    table_data['table_id'],
+                existing = cursor.execute(_SELECT_CONTENT_HASH, (table_id,)).fetchone()
+                
+                # Insert or update table metadata in place
+                cursor.execute(_UPSERT_TABLE, (
+                    table_id,
                     table_data['source_file'],
                     table_data['rows'],
                     table_data['columns'],
-                    json.dumps(table_data['column_names']),
-                    json.dumps(table_data['column_types']),
-                    table_data.get('description', '')
+                    _json_dumps(table_data['column_names']),
+                    _json_dumps(table_data['column_types']),
+                    table_data.get('description', ''),
+                    content_hash
                 ))
                 
-                # Delete existing row data for this table (in case of update)
-                cursor.execute("DELETE FROM table_data WHERE table_id = ?", (table_data['table_id'],))
-                
-                # Insert row data
-                for row_index, row in enumerate(table_data['row_data']):
-                    cursor.execute("""
-                        INSERT INTO table_data (table_id, row_index, row_data)
-                        VALUES (?, ?, ?)
-                    """, (
-                        table_data['table_id'],
-                        row_index,
-                        json.dumps(row)
-                    ))
+                # Rewrite row data only when it changed since the last store
+                if existing is None or existing[0] != content_hash:
+                    cursor.execute(_DELETE_TABLE_ROWS, (table_id,))
+                    self._insert_row_data(cursor, table_id, encoded_rows)
                 
                 if self.auto_commit:
                     conn.commit()
                 
                 logger.info(f"Successfully stored table {table_data['table_id']}")
+                self._invalidate_summary()
                 return True
                 
         except sqlite3.Error as e:
@@ -161,27 +392,12 @@ class SQLiteDatabaseService(DatabaseService):
     def get_table_metadata(self, table_id: str) -> Optional[TableMetadata]:
         """Retrieve metadata for a specific table."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT table_id, source_file, rows, columns, column_names, column_types, description, created_at
-                    FROM tables WHERE table_id = ?
-                """, (table_id,))
-                
-                row = cursor.fetchone()
+            with self._get_connection() as conn:
+                row = conn.execute(_SELECT_METADATA_BY_ID, (table_id,)).fetchone()
                 if not row:
                     return None
                 
-                return TableMetadata(
-                    table_id=row[0],
-                    source_file=row[1],
-                    rows=row[2],
-                    columns=row[3],
-                    column_names=json.loads(row[4]),
-                    column_types=json.loads(row[5]),
-                    description=row[6],
-                    created_at=datetime.fromisoformat(row[7]) if row[7] else None
-                )
+                return self._row_to_metadata(row)
                 
         except (sqlite3.Error, json.JSONDecodeError) as e:
             logger.error(f"Failed to get metadata for table {table_id}: {e}")
@@ -190,31 +406,8 @@ class SQLiteDatabaseService(DatabaseService):
     def get_tables_by_source(self, source_file: str) -> List[TableMetadata]:
         """Retrieve all tables from a specific source file."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT table_id, source_file, rows, columns, column_names, column_types, description, created_at
-                    FROM tables WHERE source_file = ?
-                """, (source_file,))
-                
-                tables = []
-                for row in cursor.fetchall():
-                    try:
-                        tables.append(TableMetadata(
-                            table_id=row[0],
-                            source_file=row[1],
-                            rows=row[2],
-                            columns=row[3],
-                            column_names=json.loads(row[4]),
-                            column_types=json.loads(row[5]),
-                            description=row[6],
-                            created_at=datetime.fromisoformat(row[7]) if row[7] else None
-                        ))
-                    except (json.JSONDecodeError, ValueError) as e:
-                        logger.warning(f"Skipping table {row[0]} due to data error: {e}")
-                        continue
-                
-                return tables
+            with self._get_connection() as conn:
+                return self._rows_to_metadata(conn.execute(_SELECT_METADATA_BY_SOURCE, (source_file,)))
                 
         except sqlite3.Error as e:
             logger.error(f"Failed to get tables for source {source_file}: {e}")
@@ -223,50 +416,97 @@ class SQLiteDatabaseService(DatabaseService):
     def get_all_tables(self) -> List[TableMetadata]:
         """Retrieve metadata for all stored tables."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT table_id, source_file, rows, columns, column_names, column_types, description, created_at
-                    FROM tables ORDER BY created_at DESC
-                """)
+            with self._get_connection() as conn:
+                return self._rows_to_metadata(conn.execute(_SELECT_ALL_METADATA))
                 
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get all tables: {e}")
+            return []
+    
+    def iter_table_schemas(self) -> Iterator[Dict[str, Any]]:
+        """Yield each table's metadata as it is fetched, newest first."""
+        cursor = self._get_connection().cursor()
+        cursor.arraysize = self._FETCH_ARRAYSIZE
+        try:
+            cursor.execute(_SELECT_ALL_METADATA)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    try:
+                        yield self._row_to_metadata(row).to_dict()
+                    except (json.JSONDecodeError, ValueError) as e:
+                        logger.warning(f"Skipping table {row[0]} due to data error: {e}")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to iterate table schemas: {e}")
+        finally:
+            cursor.close()
+    
+    def get_tables_with_stats(self) -> List[Dict[str, Any]]:
+        """Retrieve metadata and stored row counts for all tables in one query."""
+        try:
+            with self._get_connection() as conn:
                 tables = []
-                for row in cursor.fetchall():
+                for row in conn.execute(_SELECT_TABLES_WITH_STATS):
                     try:
-                        tables.append(TableMetadata(
-                            table_id=row[0],
-                            source_file=row[1],
-                            rows=row[2],
-                            columns=row[3],
-                            column_names=json.loads(row[4]),
-                            column_types=json.loads(row[5]),
-                            description=row[6],
-                            created_at=datetime.fromisoformat(row[7]) if row[7] else None
-                        ))
+                        tables.append({**self._row_to_metadata(row).to_dict(), 'stored_rows': row[8]})
                     except (json.JSONDecodeError, ValueError) as e:
                         logger.warning(f"Skipping table {row[0]} due to data error: {e}")
-                        continue
-                
                 return tables
                 
         except sqlite3.Error as e:
-            logger.error(f"Failed to get all tables: {e}")
+            logger.error(f"Failed to get tables with stats: {e}")
             return []
     
+    @staticmethod
+    def _row_to_metadata(row: tuple) -> TableMetadata:
+        """Build TableMetadata from a row of the standard metadata SELECT."""
+        created_at = row[7]
+        return TableMetadata(
+            table_id=row[0],
+            source_file=row[1],
+            rows=row[2],
+            columns=row[3],
+            column_names=_json_loads(row[4]),
+            column_types=_json_loads(row[5]),
+            description=row[6],
+            created_at=datetime.fromisoformat(created_at) if created_at else None
+        )
+    
+    @classmethod
+    def _rows_to_metadata(cls, rows) -> List[TableMetadata]:
+        """
+        Decode metadata rows, skipping any with malformed stored values.
+        
+        Args:
+            rows: Iterable of metadata rows, typically the cursor itself so rows
+                are decoded as they are fetched instead of via fetchall()
+            
+        Returns:
+            List of TableMetadata objects
+        """
+        to_metadata = cls._row_to_metadata
+        tables = []
+        for row in rows:
+            try:
+                tables.append(to_metadata(row))
+            except (json.JSONDecodeError, ValueError) as e:
+                logger.warning(f"Skipping table {row[0]} due to data error: {e}")
+        return tables
+    
     def table_exists(self, table_id: str) -> bool:
         """Check if a table exists in the database."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1 FROM tables WHERE table_id = ?", (table_id,))
-                return cursor.fetchone() is not None
+            with self._get_connection() as conn:
+                return conn.execute(_SELECT_TABLE_EXISTS, (table_id,)).fetchone() is not None
         except sqlite3.Error:
             return False
     
     def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> QueryResult:
         """Execute a raw SQL query."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Convert parameters to tuple if provided
@@ -298,6 +538,8 @@ class SQLiteDatabaseService(DatabaseService):
                     if self.auto_commit:
                         conn.commit()
                     
+                    self._invalidate_summary()
+                    
                     return QueryResult(
                         success=True,
                         data=[],
@@ -312,39 +554,59 @@ class SQLiteDatabaseService(DatabaseService):
                 error=str(e)
             )
     
-    def get_table_data(self, table_id: str, limit: Optional[int] = None, offset: Optional[int] = None) -> QueryResult:
-        """Retrieve row data for a specific table."""
-        try:
-            query = "SELECT row_index, row_data FROM table_data WHERE table_id = ? ORDER BY row_index"
-            params = [table_id]
+    def iter_table_rows(self, table_id: str, limit: Optional[int] = None,
+                        offset: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a table's rows in row order, decoding them as they are fetched.
+        
+        Unlike get_table_data, the table is never held in memory as a whole,
+        so callers that process rows one at a time can handle tables of any size.
+        
+        Args:
+            table_id: Unique identifier for the table
+            limit: Maximum number of rows to return
+            offset: Number of rows to skip
             
-            if limit is not None:
-                query += " LIMIT ?"
-                params.append(limit)
-                
-            if offset is not None:
-                query += " OFFSET ?"
-                params.append(offset)
+        Yields:
+            Row dictionaries with the row index under '_row_index'
             
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                
-                data = []
-                for row in cursor.fetchall():
+        Raises:
+            sqlite3.Error: If the query fails
+        """
+        if limit is None and offset is None:
+            query, params = _SELECT_TABLE_ROWS, (table_id,)
+        else:
+            query = _SELECT_TABLE_ROWS_PAGE
+            params = (table_id, limit if limit is not None else -1, offset or 0)
+        
+        cursor = self._get_connection().cursor()
+        cursor.arraysize = self._FETCH_ARRAYSIZE
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for row_index, row_json in rows:
                     try:
-                        row_data = json.loads(row[1])
-                        row_data['_row_index'] = row[0]  # Add row index
-                        data.append(row_data)
+                        row_data = _json_loads(row_json)
                     except json.JSONDecodeError as e:
-                        logger.warning(f"Skipping row {row[0]} due to JSON decode error: {e}")
+                        logger.warning(f"Skipping row {row_index} due to JSON decode error: {e}")
                         continue
-                
-                return QueryResult(
-                    success=True,
-                    data=data,
-                    metadata={"table_id": table_id, "rows_returned": len(data)}
-                )
+                    row_data['_row_index'] = row_index  # Add row index
+                    yield row_data
+        finally:
+            cursor.close()
+    
+    def get_table_data(self, table_id: str, limit: Optional[int] = None, offset: Optional[int] = None) -> QueryResult:
+        """Retrieve row data for a specific table."""
+        try:
+            data = list(self.iter_table_rows(table_id, limit=limit, offset=offset))
+            return QueryResult(
+                success=True,
+                data=data,
+                metadata={"table_id": table_id, "rows_returned": len(data)}
+            )
                 
         except sqlite3.Error as e:
             logger.error(f"Failed to get data for table {table_id}: {e}")
@@ -354,52 +616,148 @@ class SQLiteDatabaseService(DatabaseService):
                 error=str(e)
             )
     
+    @staticmethod
+    def _create_stats_counters(cursor: sqlite3.Cursor) -> None:
+        """Create the stats table and the triggers that keep its counters current.
+        
+        Table, session and source-file counts change once per stored table, so
+        triggers keep them exact for every writer. table_data is deliberately
+        left out: a per-row trigger more than doubles bulk insert time.
+        """
+        exists = cursor.execute(_SCHEMA_TABLE_EXISTS, ('stats',)).fetchone()
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS stats_tables_insert AFTER INSERT ON tables BEGIN
+                UPDATE stats SET value = value + 1 WHERE key = 'total_tables';
+                UPDATE stats SET value = value + 1 WHERE key = 'unique_source_files'
+                    AND NOT EXISTS (SELECT 1 FROM tables WHERE source_file = new.source_file AND id != new.id);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS stats_tables_delete AFTER DELETE ON tables BEGIN
+                UPDATE stats SET value = value - 1 WHERE key = 'total_tables';
+                UPDATE stats SET value = value - 1 WHERE key = 'unique_source_files'
+                    AND NOT EXISTS (SELECT 1 FROM tables WHERE source_file = old.source_file);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS stats_tables_update AFTER UPDATE OF source_file ON tables
+            WHEN old.source_file IS NOT new.source_file BEGIN
+                UPDATE stats SET value = value + 1 WHERE key = 'unique_source_files'
+                    AND NOT EXISTS (SELECT 1 FROM tables WHERE source_file = new.source_file AND id != new.id);
+                UPDATE stats SET value = value - 1 WHERE key = 'unique_source_files'
+                    AND NOT EXISTS (SELECT 1 FROM tables WHERE source_file = old.source_file);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS stats_sessions_insert AFTER INSERT ON processing_sessions BEGIN
+                UPDATE stats SET value = value + 1 WHERE key = 'total_sessions';
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS stats_sessions_delete AFTER DELETE ON processing_sessions BEGIN
+                UPDATE stats SET value = value - 1 WHERE key = 'total_sessions';
+            END
+        """)
+        
+        # Seed the counters from databases that already hold data
+        if not exists:
+            cursor.execute("""
+                INSERT INTO stats (key, value)
+                SELECT 'total_tables', COUNT(*) FROM tables
+                UNION ALL SELECT 'total_sessions', COUNT(*) FROM processing_sessions
+                UNION ALL SELECT 'unique_source_files', COUNT(DISTINCT source_file) FROM tables
+            """)
+    
+    @staticmethod
+    def _create_search_index(cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index over table metadata, kept in sync by triggers.
+        
+        Returns:
+            True if the index is usable, False if this SQLite build lacks FTS5
+        """
+        try:
+            exists = cursor.execute(_SCHEMA_TABLE_EXISTS, ('tables_fts',)).fetchone()
+            
+            # The trigram tokenizer matches arbitrary substrings case-insensitively,
+            # the same results the LIKE '%term%' scan gives for terms of 3+ chars
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS tables_fts USING fts5(
+                    table_id, source_file, description,
+                    content='tables', content_rowid='id', tokenize='trigram'
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS tables_fts_insert AFTER INSERT ON tables BEGIN
+                    INSERT INTO tables_fts(rowid, table_id, source_file, description)
+                    VALUES (new.id, new.table_id, new.source_file, new.description);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS tables_fts_delete AFTER DELETE ON tables BEGIN
+                    INSERT INTO tables_fts(tables_fts, rowid, table_id, source_file, description)
+                    VALUES ('delete', old.id, old.table_id, old.source_file, old.description);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS tables_fts_update AFTER UPDATE ON tables BEGIN
+                    INSERT INTO tables_fts(tables_fts, rowid, table_id, source_file, description)
+                    VALUES ('delete', old.id, old.table_id, old.source_file, old.description);
+                    INSERT INTO tables_fts(rowid, table_id, source_file, description)
+                    VALUES (new.id, new.table_id, new.source_file, new.description);
+                END
+            """)
+            
+            # Index rows stored before the FTS table existed
+            if not exists:
+                cursor.execute("INSERT INTO tables_fts(tables_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, table search falls back to LIKE scans: {e}")
+            return False
+    
+    def _has_search_index(self) -> bool:
+        """Check (once per service) whether the database carries the FTS5 index."""
+        if self._fts_enabled is None:
+            try:
+                with self._get_connection() as conn:
+                    self._fts_enabled = conn.execute(
+                        _SCHEMA_TABLE_EXISTS, ('tables_fts',)
+                    ).fetchone() is not None
+            except sqlite3.Error:
+                self._fts_enabled = False
+        return self._fts_enabled
+    
     def search_tables(self, search_term: str, search_fields: Optional[List[str]] = None) -> List[TableMetadata]:
         """Search for tables based on metadata fields."""
         if search_fields is None:
             search_fields = ['table_id', 'source_file', 'description']
         
         try:
-            # Build search query
-            conditions = []
-            params = []
-            
-            for field in search_fields:
-                if field in ['table_id', 'source_file', 'description']:
-                    conditions.append(f"{field} LIKE ?")
-                    params.append(f"%{search_term}%")
-            
-            if not conditions:
+            fields = [field for field in search_fields if field in ('table_id', 'source_file', 'description')]
+            if not fields:
                 return []
             
-            query = f"""
-                SELECT table_id, source_file, rows, columns, column_names, column_types, description, created_at
-                FROM tables WHERE {' OR '.join(conditions)}
-                ORDER BY created_at DESC
-            """
+            # Trigrams need at least three characters; shorter terms and
+            # LIKE wildcards keep the plain scan
+            if (len(search_term) >= 3 and not any(c in search_term for c in '%_')
+                    and self._has_search_index()):
+                phrase = search_term.replace('"', '""')
+                params = [f'{{{" ".join(fields)}}} : "{phrase}"']
+                query = _SEARCH_METADATA_FTS
+            else:
+                conditions = [f"{field} LIKE ?" for field in fields]
+                params = [f"%{search_term}%"] * len(fields)
+                query = f"{_SELECT_TABLE_METADATA} WHERE {' OR '.join(conditions)} ORDER BY created_at DESC"
             
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                
-                tables = []
-                for row in cursor.fetchall():
-                    try:
-                        tables.append(TableMetadata(
-                            table_id=row[0],
-                            source_file=row[1],
-                            rows=row[2],
-                            columns=row[3],
-                            column_names=json.loads(row[4]),
-                            column_types=json.loads(row[5]),
-                            description=row[6],
-                            created_at=datetime.fromisoformat(row[7]) if row[7] else None
-                        ))
-                    except (json.JSONDecodeError, ValueError) as e:
-                        logger.warning(f"Skipping table {row[0]} due to data error: {e}")
-                        continue
-                
-                return tables
+            with self._get_connection() as conn:
+                return self._rows_to_metadata(conn.execute(query, params))
                 
         except sqlite3.Error as e:
             logger.error(f"Search failed: {e}")
@@ -410,17 +768,14 @@ class SQLiteDatabaseService(DatabaseService):
         session_id = str(uuid.uuid4())
         
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO processing_sessions (session_id, source_file)
-                    VALUES (?, ?)
-                """, (session_id, source_file))
+            with self._get_connection() as conn:
+                conn.execute(_INSERT_SESSION, (session_id, source_file))
                 
                 if self.auto_commit:
                     conn.commit()
                 
                 logger.info(f"Created session {session_id} for {source_file}")
+                self._invalidate_summary()
                 return session_id
                 
         except sqlite3.Error as e:
@@ -430,13 +785,8 @@ class SQLiteDatabaseService(DatabaseService):
     def update_session(self, session_id: str, total_tables: int, successful_tables: int) -> bool:
         """Update session statistics."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE processing_sessions 
-                    SET total_tables = ?, successful_tables = ?
-                    WHERE session_id = ?
-                """, (total_tables, successful_tables, session_id))
+            with self._get_connection() as conn:
+                cursor = conn.execute(_UPDATE_SESSION, (total_tables, successful_tables, session_id))
                 
                 if self.auto_commit:
                     conn.commit()
@@ -450,14 +800,8 @@ class SQLiteDatabaseService(DatabaseService):
     def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve session information."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT session_id, source_file, total_tables, successful_tables, created_at
-                    FROM processing_sessions WHERE session_id = ?
-                """, (session_id,))
-                
-                row = cursor.fetchone()
+            with self._get_connection() as conn:
+                row = conn.execute(_SELECT_SESSION, (session_id,)).fetchone()
                 if not row:
                     return None
                 
@@ -473,31 +817,49 @@ class SQLiteDatabaseService(DatabaseService):
             logger.error(f"Failed to get session info for {session_id}: {e}")
             return None
     
+    def _db_fingerprint(self) -> tuple:
+        """
+        Stat the database file and its WAL so writes from other connections or
+        processes are noticed without querying the database.
+        """
+        fingerprint = []
+        for path in (self.db_path, f"{self.db_path}-wal"):
+            try:
+                st = os.stat(path)
+                fingerprint.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                fingerprint.append(None)
+        return tuple(fingerprint)
+    
+    def _invalidate_summary(self) -> None:
+        """Drop the cached database summary after a write."""
+        self._summary_cache = None
+    
     def get_database_summary(self) -> Dict[str, Any]:
         """Get summary statistics about the database."""
+        fingerprint = self._db_fingerprint()
+        if self._summary_cache is not None and fingerprint == self._summary_fingerprint:
+            return dict(self._summary_cache)
+        
+        summary = self._compute_database_summary()
+        if summary:
+            self._summary_cache = summary
+            self._summary_fingerprint = fingerprint
+        return dict(summary)
+    
+    def _compute_database_summary(self) -> Dict[str, Any]:
+        """Run the aggregate queries behind get_database_summary()."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                
-                # Get table counts
-                cursor.execute("SELECT COUNT(*) FROM tables")
-                total_tables = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM table_data")
-                total_rows = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM processing_sessions")
-                total_sessions = cursor.fetchone()[0]
-                
-                # Get source file info
-                cursor.execute("SELECT COUNT(DISTINCT source_file) FROM tables")
-                unique_sources = cursor.fetchone()[0]
+            with self._get_connection() as conn:
+                # Table, session and source counts are trigger-maintained
+                counters = dict(conn.execute(_SELECT_STATS).fetchall())
+                total_rows = conn.execute(_COUNT_TABLE_ROWS).fetchone()[0]
                 
                 return {
-                    'total_tables': total_tables,
+                    'total_tables': counters.get('total_tables', 0),
                     'total_rows': total_rows,
-                    'total_sessions': total_sessions,
-                    'unique_source_files': unique_sources,
+                    'total_sessions': counters.get('total_sessions', 0),
+                    'unique_source_files': counters.get('unique_source_files', 0),
                     'database_path': self.db_path
                 }
                 
@@ -508,17 +870,16 @@ class SQLiteDatabaseService(DatabaseService):
     def clear_database(self) -> bool:
         """Clear all data from the database."""
         try:
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("DELETE FROM table_data")
-                cursor.execute("DELETE FROM tables")
-                cursor.execute("DELETE FROM processing_sessions")
+            with self._get_connection() as conn:
+                conn.execute("DELETE FROM table_data")
+                conn.execute("DELETE FROM tables")
+                conn.execute("DELETE FROM processing_sessions")
                 
                 if self.auto_commit:
                     conn.commit()
                 
                 logger.info("Database cleared successfully")
+                self._invalidate_summary()
                 return True
                 
         except sqlite3.Error as e:
@@ -531,9 +892,18 @@ class SQLiteDatabaseService(DatabaseService):
             # Ensure backup directory exists
             Path(backup_path).parent.mkdir(parents=True, exist_ok=True)
             
-            with sqlite3.connect(self.db_path, timeout=self.timeout) as source:
+            steps = 0
+            
+            def log_progress(status: int, remaining: int, total: int) -> None:
+                nonlocal steps
+                steps += 1
+                if steps % self._BACKUP_LOG_STEPS == 0:
+                    logger.debug(f"Backup to {backup_path}: {total - remaining}/{total} pages copied")
+            
+            with self._get_connection() as source:
                 with sqlite3.connect(backup_path) as backup:
-                    source.backup(backup)
+                    source.backup(backup, pages=self._BACKUP_PAGES,
+                                  progress=log_progress, sleep=self._BACKUP_SLEEP)
             
             logger.info(f"Database backed up to {backup_path}")
             return True
@@ -550,10 +920,14 @@ class SQLiteDatabaseService(DatabaseService):
                 return False
             
             with sqlite3.connect(backup_path, timeout=self.timeout) as backup:
-                with sqlite3.connect(self.db_path) as target:
+                with self._get_connection() as target:
                     backup.backup(target)
+                    # The backup may predate columns, counters or the search index
+                    self._fts_enabled = self._ensure_schema(target.cursor())
+                    target.commit()
             
             logger.info(f"Database restored from {backup_path}")
+            self._invalidate_summary()
             return True
             
         except sqlite3.Error as e:
@@ -5,12 +5,241 @@ This module defines the interface for LLM services, making it easy to
 plug in different LLM providers (OpenAI, Anthropic, local models, etc.).
 """
 
+import functools
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple, Union
 
+from ._compat import _DATACLASS_OPTIONS, _json_dumps, _json_loads
 
-@dataclass
+# Static instructions sent as the system message. They are identical bytes
+# on every call, so providers that cache prompt prefixes can reuse them;
+# only the user message carries per-call data.
+_TABLE_DESCRIPTION_SYSTEM_PROMPT = """Analyze the table provided by the user and provide a clear, informative description.
+
+Please provide:
+1. What type of data this table contains
+2. The main purpose or use case of this table
+3. Any notable patterns or relationships in the data
+4. Which columns are most important for understanding the table
+
+Respond with a single paragraph description that would help someone quickly understand this table's content and purpose."""
+
+_SQL_SYSTEM_PROMPT = """You are an expert SQL query generator. Generate a SQLite-compatible SQL query to answer the user's question.
+
+Important Rules:
+1. ONLY return the SQL query, nothing else
+2. Use exact table and column names from the schema
+3. Use SQLite-compatible syntax
+4. For table_data.row_data (JSON object), use json_extract(row_data, '$.\"ColumnName\"') to access fields
+5. Cast JSON values to correct types - use CAST(json_extract(...) AS INTEGER) for integers, CAST(json_extract(...) AS REAL) for numbers
+6. json_extract() returns raw values - for strings compare with 'Value', NOT '\"Value\"' (no extra quotes)"""
+
+# Physical layout every formatted database schema starts with
+_SCHEMA_PROMPT_HEADER = """SQL tables:
+  tables(table_id, source_file, rows, columns, column_names, column_types, description)
+  table_data(table_id, row_index, row_data) -- row_data is a JSON object keyed by column name
+Stored tables (query their rows via table_data.table_id):"""
+
+_SQL_PROMPT_TAIL = """
+
+Generate ONLY the SQL query (no explanations, no markdown formatting):"""
+
+_QUERY_ANALYSIS_SYSTEM_PROMPT = """You are an expert database query analyst. Determine if a user's question can be answered by querying the available table data.
+
+Analyze whether the user's query can be fulfilled by querying the available tables. Consider:
+1. Does the query ask for information that could be contained in the tables?
+2. Are the required data fields likely present in the table columns?
+3. Is the query asking for data aggregation, filtering, or specific lookups that are feasible with SQL?
+
+Respond with a JSON object in this exact format:
+{
+    "is_fulfillable": true/false,
+    "confidence": 0.0-1.0,
+    "reasoning": "Detailed explanation of your analysis",
+    "suggested_approach": "How to approach this query (if fulfillable) or alternative suggestions",
+    "required_tables": ["list", "of", "table_ids", "needed"]
+}
+
+Be precise and only return the JSON object."""
+
+# The system messages themselves are built once and shared by every request;
+# message lists are only read, never mutated, once built
+_TABLE_DESCRIPTION_SYSTEM_MESSAGE = {"role": "system", "content": _TABLE_DESCRIPTION_SYSTEM_PROMPT}
+_SQL_SYSTEM_MESSAGE = {"role": "system", "content": _SQL_SYSTEM_PROMPT}
+_QUERY_ANALYSIS_SYSTEM_MESSAGE = {"role": "system", "content": _QUERY_ANALYSIS_SYSTEM_PROMPT}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_column_names(column_names: str) -> Any:
+    """Decode column names stored as a JSON string, once per distinct string."""
+    try:
+        columns = json.loads(column_names)
+    except ValueError:
+        return column_names
+    return tuple(columns) if isinstance(columns, list) else columns
+
+
+def _normalize_column_names(column_names: Any) -> Any:
+    """Return column names as a tuple where they are a list or a JSON list string."""
+    if isinstance(column_names, list):
+        return tuple(column_names)
+    if isinstance(column_names, str):
+        return _parse_column_names(column_names)
+    return column_names
+
+
+@functools.lru_cache(maxsize=128)
+def _format_tables_context_cached(tables_key: tuple) -> str:
+    """
+    Format the tables context from (table_id, source_file, rows, columns,
+    column_names, description) tuples; see LLMService._format_tables_context.
+    """
+    # Each segment carries its own leading newline so a single join builds
+    # the text; a blank line separates the header and each table's block
+    out = ["Available tables in the database:"]
+    
+    for table_id, source_file, rows, column_count, columns, description in tables_key:
+        out.append(
+            f"\n\n- Table: {table_id}\n  Source: {source_file}\n  Rows: {rows}, Columns: {column_count}"
+        )
+        if columns:
+            out.append(f"\n  Columns: {', '.join(columns) if isinstance(columns, tuple) else columns}")
+        if description:
+            out.append(f"\n  Description: {description}")
+    
+    return "".join(out)
+
+
+# Words that carry no signal about which table could answer a query: function
+# words, plus the aggregate and generic words ("count", "average", "entries")
+# that fit any table but never appear in a table's own vocabulary
+_QUERY_STOPWORDS = frozenset((
+    "a", "about", "all", "an", "and", "any", "are", "as", "at", "be", "by", "can", "could",
+    "data", "do", "does", "for", "from", "get", "give", "how", "i", "in", "is", "it", "list",
+    "many", "me", "much", "my", "of", "on", "or", "please", "show", "some", "tell", "that",
+    "the", "there", "these", "this", "to", "was", "what", "when", "where", "which", "who",
+    "why", "with", "you",
+    "average", "avg", "biggest", "compare", "count", "different", "distinct", "each", "entries",
+    "entry", "every", "find", "first", "group", "have", "has", "highest", "item", "items",
+    "largest", "last", "least", "lowest", "max", "maximum", "mean", "median", "min", "minimum",
+    "most", "number", "order", "per", "record", "records", "row", "rows", "smallest", "sort",
+    "sum", "table", "tables", "top", "total", "unique", "value", "values"
+))
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _singular(word: str) -> str:
+    """Strip a regular English plural ending ("entries" -> "entry", "swords" -> "sword")."""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def _content_words(text: str) -> set:
+    """Lowercased, singularized words of text minus stopwords and single letters."""
+    words = set()
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if len(word) < 2 or word in _QUERY_STOPWORDS:
+            continue
+        words.add(_singular(word))
+    return words
+
+
+@functools.lru_cache(maxsize=32)
+def _tables_vocabulary(tables_key: tuple) -> frozenset:
+    """Content words naming the tables, their sources, columns and descriptions."""
+    words = set()
+    for table_id, source_file, _rows, _column_count, columns, description in tables_key:
+        words |= _content_words(f"{table_id} {source_file}")
+        if columns:
+            words |= _content_words(" ".join(map(str, columns)) if isinstance(columns, tuple) else str(columns))
+        if description:
+            words |= _content_words(str(description))
+    return frozenset(words)
+
+
+def coalesce_stream(chunks: Iterator[str], flush_interval: float = 0.1) -> Iterator[str]:
+    """
+    Merge streamed text deltas into larger pieces.
+    
+    Deltas are accumulated and yielded together once flush_interval seconds
+    have passed since the last yield, so consumers handle a few pieces per
+    second instead of one per token. Whatever remains is yielded at the end.
+    
+    Args:
+        chunks: Text deltas as they arrive
+        flush_interval: Minimum seconds between yields (0 passes deltas through)
+        
+    Yields:
+        Concatenated deltas
+    """
+    buffer: List[str] = []
+    last_flush = time.monotonic()
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer.append(chunk)
+        now = time.monotonic()
+        if now - last_flush >= flush_interval:
+            yield "".join(buffer)
+            buffer.clear()
+            last_flush = now
+    if buffer:
+        yield "".join(buffer)
+
+
+@functools.lru_cache(maxsize=32)
+def _format_database_schema_cached(tables_key: tuple) -> str:
+    """
+    Format a compact, DDL-like schema from (table_id, source_file, rows,
+    column_names, column_types, description) tuples; see
+    LLMService._format_database_schema.
+    """
+    lines = [_SCHEMA_PROMPT_HEADER]
+    
+    for table_id, source_file, rows, columns, column_types, description in tables_key:
+        lines.append(f"- table_id '{table_id}' ({rows} rows, from {source_file})")
+        if columns:
+            if isinstance(columns, tuple):
+                types = dict(column_types)
+                columns = ", ".join(
+                    f"{name} {types[name]}" if name in types else str(name) for name in columns
+                )
+            lines.append(f"  Columns: {columns}")
+        if description:
+            lines.append(f"  Description: {description}")
+    
+    return "\n".join(lines)
+
+
+_CREATE_LLM_CACHE = """
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        prompt_hash BLOB PRIMARY KEY,
+        response TEXT NOT NULL,
+        metadata TEXT,
+        created_at INTEGER NOT NULL
+    )
+"""
+_SELECT_LLM_CACHE = "SELECT response, metadata, created_at FROM llm_cache WHERE prompt_hash = ?"
+_INSERT_LLM_CACHE = (
+    "INSERT OR REPLACE INTO llm_cache (prompt_hash, response, metadata, created_at) VALUES (?, ?, ?, ?)"
+)
+_DELETE_LLM_CACHE_BEFORE = "DELETE FROM llm_cache WHERE created_at < ?"
+_DELETE_LLM_CACHE = "DELETE FROM llm_cache"
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class LLMResponse:
     """Standard response format for LLM services."""
     content: str
@@ -32,8 +261,27 @@ class LLMService(ABC):
         
         Args:
             **config: Service-specific configuration parameters
+                (prompt_cache_size sets how many convenience-method
+                responses are kept in memory, 0 disables that cache;
+                persistent_cache_path names an SQLite file that keeps them
+                across runs, and persistent_cache_ttl expires its entries
+                after that many seconds; feasibility_prefilter lets
+                analyze_query_feasibility reject queries sharing no words
+                with the tables without calling the model)
         """
         self.config = config
+        
+        # LRU cache of successful responses from the convenience methods,
+        # keyed on a hash of the prompt and generation parameters
+        self.prompt_cache_size = config.get('prompt_cache_size', 128)
+        self._llm_cache: "OrderedDict[str, LLMResponse]" = OrderedDict()
+        self._llm_cache_lock = threading.Lock()
+        
+        # Optional on-disk tier behind the LRU cache, opened on first use
+        self.persistent_cache_path = config.get('persistent_cache_path')
+        self.persistent_cache_ttl = config.get('persistent_cache_ttl')
+        self._cache_db: Optional[sqlite3.Connection] = None
+        self._cache_db_lock = threading.Lock()
     
     @abstractmethod
     def generate_completion(self, prompt: str, **kwargs) -> LLMResponse:
@@ -73,6 +321,106 @@ class LLMService(ABC):
         """
         pass
     
+    def generate_chat_completion_stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """
+        Generate a chat completion, yielding text as it is produced.
+        
+        The default implementation makes a regular request and yields the
+        whole completion once; implementations with a streaming endpoint
+        should override it.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            **kwargs: Additional generation parameters
+            
+        Yields:
+            Pieces of the completion text, in order
+            
+        Raises:
+            RuntimeError: If the request fails
+        """
+        response = self.generate_chat_completion(messages, **kwargs)
+        if not response.success:
+            raise RuntimeError(response.error or "Completion failed")
+        yield response.content
+    
+    def generate_completion_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Generate a completion for the given prompt, yielding text as it is produced.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+            
+        Yields:
+            Pieces of the completion text, in order
+            
+        Raises:
+            RuntimeError: If the request fails
+        """
+        return self.generate_chat_completion_stream([{"role": "user", "content": prompt}], **kwargs)
+    
+    def generate_chat_completion_many(self, message_lists: List[List[Dict[str, str]]],
+                                      max_workers: int = 16, **kwargs) -> List[LLMResponse]:
+        """
+        Generate chat completions for several conversations concurrently.
+        
+        Requests are I/O-bound, so a thread pool overlaps their round-trips
+        without needing an async runtime. Implementations must keep
+        generate_chat_completion safe to call from multiple threads.
+        
+        Args:
+            message_lists: One list of message dictionaries per completion
+            max_workers: Maximum number of requests in flight at once
+            **kwargs: Generation parameters applied to every request
+            
+        Returns:
+            LLMResponse per message list, in input order
+        """
+        if not message_lists:
+            return []
+        
+        workers = min(max_workers, len(message_lists))
+        if workers <= 1:
+            return [self.generate_chat_completion(messages, **kwargs) for messages in message_lists]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda messages: self.generate_chat_completion(messages, **kwargs), message_lists
+            ))
+    
+    def generate_completions_batch(self, prompts: List[Union[str, List[Dict[str, str]]]],
+                                   **kwargs) -> List[LLMResponse]:
+        """
+        Generate completions for several prompts.
+        
+        The default implementation runs generate_completion on a thread pool
+        of at most max_concurrency workers (service config, default 10), which
+        bounds the number of requests in flight against provider rate limits.
+        Implementations with a native batch endpoint can override it.
+        
+        Args:
+            prompts: Input prompts, each a string or a list of chat messages
+            **kwargs: Generation parameters applied to every prompt
+            
+        Returns:
+            LLMResponse per prompt, in input order
+        """
+        if not prompts:
+            return []
+        
+        def generate(prompt):
+            if isinstance(prompt, str):
+                return self.generate_completion(prompt, **kwargs)
+            return self.generate_chat_completion(prompt, **kwargs)
+        
+        workers = min(self.config.get('max_concurrency', 10), len(prompts))
+        if workers <= 1:
+            return [generate(prompt) for prompt in prompts]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(generate, prompts))
+    
     def generate_table_description(self, schema: Dict[str, Any], context_hint: str = "") -> LLMResponse:
         """
         Generate a description for a table based on its schema.
@@ -85,8 +433,29 @@ class LLMService(ABC):
         Returns:
             LLMResponse with table description
         """
-        prompt = self._build_table_description_prompt(schema, context_hint)
-        return self.generate_completion(prompt, temperature=0.1, max_tokens=300)
+        messages = self._build_table_description_messages(schema, context_hint)
+        return self._generate_cached(messages, temperature=0.1, max_tokens=300)
+    
+    def generate_table_description_stream(self, schema: Dict[str, Any],
+                                          context_hint: str = "") -> Iterator[str]:
+        """
+        Streaming variant of generate_table_description.
+        
+        Lets callers start work on the text, or submit the next table, before
+        the description is complete. Streamed output bypasses the prompt cache.
+        
+        Args:
+            schema: Table schema dictionary
+            context_hint: Optional context to improve description quality
+            
+        Yields:
+            Pieces of the description text, in order
+            
+        Raises:
+            RuntimeError: If the request fails
+        """
+        messages = self._build_table_description_messages(schema, context_hint)
+        return self.generate_chat_completion_stream(messages, temperature=0.1, max_tokens=300)
     
     def generate_sql_query(self, user_query: str, database_schema: Dict[str, Any]) -> LLMResponse:
         """
@@ -100,8 +469,8 @@ class LLMService(ABC):
         Returns:
             LLMResponse with SQL query
         """
-        prompt = self._build_sql_generation_prompt(user_query, database_schema)
-        return self.generate_completion(prompt, temperature=0.0, max_tokens=200)
+        messages = self._build_sql_generation_messages(user_query, database_schema)
+        return self._generate_cached(messages, temperature=0.0, max_tokens=200)
     
     def analyze_query_feasibility(self, user_query: str, available_tables: List[Dict[str, Any]]) -> LLMResponse:
         """
@@ -114,111 +483,360 @@ class LLMService(ABC):
         Returns:
             LLMResponse with analysis result (JSON format)
         """
-        prompt = self._build_query_analysis_prompt(user_query, available_tables)
-        return self.generate_completion(prompt, temperature=0.1, max_tokens=500)
+        if self.config.get('feasibility_prefilter') and available_tables:
+            # A query naming specific things, none of which appear in any
+            # table's id, source, columns or description, is unlikely to be
+            # answerable from them; skip the LLM. Queries made only of generic
+            # or aggregate words leave no content words and always go to the
+            # model, and the low confidence tells callers this is a heuristic
+            query_words = _content_words(user_query)
+            if query_words and query_words.isdisjoint(self._tables_vocabulary(available_tables)):
+                return LLMResponse(
+                    content=_json_dumps({
+                        "is_fulfillable": False,
+                        "confidence": 0.5,
+                        "reasoning": "The query shares no terms with any available table's name, columns or description.",
+                        "suggested_approach": "Ask about data contained in the available tables.",
+                        "required_tables": []
+                    }),
+                    success=True,
+                    metadata={"shortcircuit": True}
+                )
+        
+        messages = self._build_query_analysis_messages(user_query, available_tables)
+        return self._generate_cached(messages, temperature=0.1, max_tokens=500)
     
-    def _build_table_description_prompt(self, schema: Dict[str, Any], context_hint: str = "") -> str:
-        """Build prompt for table description generation."""
-        table_id = schema.get('table_id', 'unknown')
-        rows = schema.get('rows', 0)
-        columns = schema.get('columns', [])
+    def generate_table_descriptions_batch(self, schemas: List[Dict[str, Any]],
+                                          context_hint: str = "") -> List[LLMResponse]:
+        """
+        Generate descriptions for several tables in one dispatch.
         
-        context_text = f"\nContext: {context_hint}" if context_hint else ""
+        Args:
+            schemas: Table schema dictionaries
+            context_hint: Optional context shared by all tables
+            
+        Returns:
+            LLMResponse per schema, in input order
+        """
+        message_lists = [self._build_table_description_messages(schema, context_hint) for schema in schemas]
+        return self._generate_cached_many(message_lists, temperature=0.1, max_tokens=300)
+    
+    def generate_sql_queries_batch(self, queries_and_schemas: List[Tuple[str, Dict[str, Any]]]) -> List[LLMResponse]:
+        """
+        Generate SQL for several natural-language queries in one dispatch.
         
-        return f"""Analyze the following table and provide a clear, informative description.
-
-Table ID: {table_id}
-Rows: {rows}
-Columns: {', '.join(columns)}{context_text}
-
-Table Data Sample:
-{schema.get('sample_data', 'No sample data available')}
-
-Please provide:
-1. What type of data this table contains
-2. The main purpose or use case of this table
-3. Any notable patterns or relationships in the data
-4. Which columns are most important for understanding the table
-
-Respond with a single paragraph description that would help someone quickly understand this table's content and purpose."""
+        Args:
+            queries_and_schemas: (user_query, database_schema) pairs
+            
+        Returns:
+            LLMResponse per pair, in input order
+        """
+        message_lists = [self._build_sql_generation_messages(query, schema) for query, schema in queries_and_schemas]
+        return self._generate_cached_many(message_lists, temperature=0.0, max_tokens=200)
     
-    def _build_sql_generation_prompt(self, user_query: str, database_schema: Dict[str, Any]) -> str:
-        """Build prompt for SQL generation."""
-        return f"""You are an expert SQL query generator. Generate a SQLite-compatible SQL query to answer the user's question.
-
-Database Schema:
-{self._format_database_schema(database_schema)}
-
-User Question: "{user_query}"
-
-Important Rules:
-1. ONLY return the SQL query, nothing else
-2. Use exact table and column names from the schema
-3. Use SQLite-compatible syntax
-4. For table_data.row_data (JSON object), use json_extract(row_data, '$.\"ColumnName\"') to access fields
-5. Cast JSON values to correct types - use CAST(json_extract(...) AS INTEGER) for integers, CAST(json_extract(...) AS REAL) for numbers
-6. json_extract() returns raw values - for strings compare with 'Value', NOT '\"Value\"' (no extra quotes)
-
-Generate ONLY the SQL query (no explanations, no markdown formatting):"""
+    def _prompt_cache_key(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> str:
+        """
+        Hash chat messages, their generation parameters and the model they are
+        sent to into a cache key. The model and endpoint are part of the key
+        because the persistent cache outlives the service that filled it.
+        """
+        target = (getattr(self, 'model_id', None), getattr(self, 'base_url', None))
+        digest = hashlib.blake2b(repr((target, sorted(kwargs.items()))).encode('utf-8'), digest_size=16)
+        for message in messages:
+            digest.update(b"\x00")
+            digest.update(message['role'].encode('utf-8'))
+            digest.update(b"\x00")
+            digest.update(message['content'].encode('utf-8'))
+        return digest.hexdigest()
     
-    def _build_query_analysis_prompt(self, user_query: str, available_tables: List[Dict[str, Any]]) -> str:
-        """Build prompt for query analysis."""
-        tables_context = self._format_tables_context(available_tables)
+    def _caching_enabled(self) -> bool:
+        """Whether the convenience methods consult any response cache."""
+        return self.prompt_cache_size > 0 or bool(self.persistent_cache_path)
+    
+    def _get_cache_db(self) -> sqlite3.Connection:
+        """Open the persistent response cache; call with _cache_db_lock held."""
+        if self._cache_db is None:
+            conn = sqlite3.connect(self.persistent_cache_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_CREATE_LLM_CACHE)
+            conn.commit()
+            self._cache_db = conn
+        return self._cache_db
+    
+    def _persistent_cache_get(self, key: str) -> Optional[LLMResponse]:
+        """Read a response from the persistent cache, or None on a miss or error."""
+        try:
+            with self._cache_db_lock:
+                row = self._get_cache_db().execute(_SELECT_LLM_CACHE, (bytes.fromhex(key),)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
         
-        return f"""You are an expert database query analyst. Determine if a user's question can be answered by querying the available table data.
-
-{tables_context}
-
-User Query: "{user_query}"
-
-Analyze whether this query can be fulfilled by querying the available tables. Consider:
-1. Does the query ask for information that could be contained in the tables?
-2. Are the required data fields likely present in the table columns?
-3. Is the query asking for data aggregation, filtering, or specific lookups that are feasible with SQL?
-
-Respond with a JSON object in this exact format:
-{{
-    "is_fulfillable": true/false,
-    "confidence": 0.0-1.0,
-    "reasoning": "Detailed explanation of your analysis",
-    "suggested_approach": "How to approach this query (if fulfillable) or alternative suggestions",
-    "required_tables": ["list", "of", "table_ids", "needed"]
-}}
-
-Be precise and only return the JSON object."""
+        content, metadata, created_at = row
+        if self.persistent_cache_ttl is not None and time.time() - created_at > self.persistent_cache_ttl:
+            return None
+        return LLMResponse(content=content, success=True, metadata=_json_loads(metadata) if metadata else {})
+    
+    def _persistent_cache_put(self, key: str, response: LLMResponse) -> None:
+        """Write a response to the persistent cache; failures only cost a future miss."""
+        try:
+            metadata = _json_dumps(response.metadata, default=str)
+            with self._cache_db_lock:
+                conn = self._get_cache_db()
+                conn.execute(_INSERT_LLM_CACHE, (bytes.fromhex(key), response.content, metadata, int(time.time())))
+                conn.commit()
+        except (sqlite3.Error, TypeError, ValueError):
+            pass
+    
+    def clear_persistent_cache(self, older_than: Optional[float] = None) -> int:
+        """
+        Remove entries from the persistent response cache.
+        
+        Args:
+            older_than: Only remove entries stored more than this many seconds
+                ago (default: remove everything)
+            
+        Returns:
+            Number of entries removed
+        """
+        if not self.persistent_cache_path:
+            return 0
+        
+        try:
+            with self._cache_db_lock:
+                conn = self._get_cache_db()
+                if older_than is None:
+                    cursor = conn.execute(_DELETE_LLM_CACHE)
+                else:
+                    cursor = conn.execute(_DELETE_LLM_CACHE_BEFORE, (int(time.time() - older_than),))
+                conn.commit()
+                return cursor.rowcount
+        except sqlite3.Error:
+            return 0
+    
+    def _cache_lookup(self, key: str) -> Optional[LLMResponse]:
+        """Return a copy of a cached response marked as cached, or None."""
+        with self._llm_cache_lock:
+            cached = self._llm_cache.get(key)
+            if cached is not None:
+                self._llm_cache.move_to_end(key)
+        
+        if cached is None and self.persistent_cache_path:
+            cached = self._persistent_cache_get(key)
+            if cached is not None:
+                self._memory_cache_store(key, cached)
+        
+        if cached is None:
+            return None
+        return LLMResponse(
+            content=cached.content,
+            success=True,
+            metadata={**cached.metadata, "cached": True}
+        )
+    
+    def _memory_cache_store(self, key: str, response: LLMResponse) -> None:
+        """Add a response to the LRU cache, evicting the least recently used."""
+        if self.prompt_cache_size <= 0:
+            return
+        with self._llm_cache_lock:
+            self._llm_cache[key] = response
+            if len(self._llm_cache) > self.prompt_cache_size:
+                self._llm_cache.popitem(last=False)
+    
+    def _cache_store(self, key: str, response: LLMResponse) -> None:
+        """Remember a successful response in every configured cache tier."""
+        if not response.success:
+            return
+        self._memory_cache_store(key, response)
+        if self.persistent_cache_path:
+            self._persistent_cache_put(key, response)
+    
+    def _generate_cached(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """
+        Generate a chat completion, reusing an earlier response to the same messages.
+        
+        The messages already encode the schema, tables and question they were
+        built from, so any change to those produces a different key.
+        
+        Unlike a provider's deterministic-only cache, this also caches the
+        low-temperature (0.1) description and analysis calls: a repeated
+        prompt gets the first sampled answer instead of a fresh sample. At
+        that temperature the variation is small and rarely worth another
+        request; set prompt_cache_size=0 (and no persistent_cache_path) to
+        sample every call.
+        
+        Args:
+            messages: Chat messages to send
+            **kwargs: Generation parameters, part of the cache key
+            
+        Returns:
+            LLMResponse, with metadata['cached'] set when served from the cache
+        """
+        if not self._caching_enabled():
+            return self.generate_chat_completion(messages, **kwargs)
+        
+        key = self._prompt_cache_key(messages, kwargs)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+        
+        response = self.generate_chat_completion(messages, **kwargs)
+        self._cache_store(key, response)
+        return response
+    
+    def _generate_cached_many(self, message_lists: List[List[Dict[str, str]]], **kwargs) -> List[LLMResponse]:
+        """
+        Batch counterpart of _generate_cached.
+        
+        Only cache misses are dispatched, and messages that are identical
+        within the batch (e.g. same-schema tables in one document) are sent
+        once; every other position that asked for it gets its own copy of the
+        response.
+        """
+        keys = [self._prompt_cache_key(messages, kwargs) for messages in message_lists]
+        use_cache = self._caching_enabled()
+        results: List[Optional[LLMResponse]] = [
+            self._cache_lookup(key) if use_cache else None for key in keys
+        ]
+        
+        # First missing position for each distinct key
+        pending: Dict[str, int] = {}
+        for index, result in enumerate(results):
+            if result is None and keys[index] not in pending:
+                pending[keys[index]] = index
+        
+        if pending:
+            # Dispatch in lexicographic order of the message text so prompts
+            # sharing a long prefix (same system prompt, same column header)
+            # reach the provider together and its prefix cache stays warm
+            order = sorted(pending, key=lambda key: [
+                message['content'] for message in message_lists[pending[key]]
+            ])
+            responses = self.generate_completions_batch(
+                [message_lists[pending[key]] for key in order], **kwargs
+            )
+            by_key = dict(zip(order, responses))
+            if use_cache:
+                for key, response in by_key.items():
+                    self._cache_store(key, response)
+            for index, result in enumerate(results):
+                if result is None:
+                    response = by_key[keys[index]]
+                    if pending[keys[index]] != index:
+                        response = LLMResponse(
+                            content=response.content,
+                            success=response.success,
+                            error=response.error,
+                            metadata=dict(response.metadata)
+                        )
+                    results[index] = response
+        
+        return results
+    
+    def _build_table_description_messages(self, schema: Dict[str, Any],
+                                          context_hint: str = "") -> List[Dict[str, str]]:
+        """Build chat messages for table description generation."""
+        columns = schema.get('columns', [])
+        context_text = f"\nContext: {context_hint}" if context_hint else ""
+        
+        table_text = "".join((
+            f"Table ID: {schema.get('table_id', 'unknown')}\n",
+            f"Rows: {schema.get('rows', 0)}\n",
+            f"Columns: {', '.join(columns)}{context_text}\n\n",
+            "Table Data Sample:\n",
+            str(schema.get('sample_data', 'No sample data available'))
+        ))
+        return [
+            _TABLE_DESCRIPTION_SYSTEM_MESSAGE,
+            {"role": "user", "content": table_text}
+        ]
+    
+    def _build_sql_generation_messages(self, user_query: str,
+                                       database_schema: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Build chat messages for SQL generation."""
+        question_text = "".join((
+            "Database Schema:\n",
+            self._format_database_schema(database_schema),
+            '\n\nUser Question: "', user_query, '"',
+            _SQL_PROMPT_TAIL
+        ))
+        return [
+            _SQL_SYSTEM_MESSAGE,
+            {"role": "user", "content": question_text}
+        ]
+    
+    def _build_query_analysis_messages(self, user_query: str,
+                                       available_tables: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Build chat messages for query analysis."""
+        query_text = "".join((
+            self._format_tables_context(available_tables),
+            '\n\nUser Query: "', user_query, '"'
+        ))
+        return [
+            _QUERY_ANALYSIS_SYSTEM_MESSAGE,
+            {"role": "user", "content": query_text}
+        ]
     
     def _format_database_schema(self, database_schema: Dict[str, Any]) -> str:
         """Format database schema for prompts."""
         # This can be overridden by specific implementations
-        return str(database_schema)
+        tables = database_schema.get('tables')
+        if not isinstance(tables, list):
+            # Not a DatabaseService.get_database_schema() result
+            return str(database_schema)
+        
+        key = tuple(
+            (
+                table.get('table_id', 'unknown'),
+                table.get('source_file', 'unknown'),
+                table.get('rows', 0),
+                _normalize_column_names(table.get('column_names')),
+                tuple(table['column_types'].items()) if isinstance(table.get('column_types'), dict)
+                else (),
+                table.get('description')
+            )
+            for table in tables
+        )
+        try:
+            return _format_database_schema_cached(key)
+        except TypeError:
+            # Unhashable field values; format without the cache
+            return _format_database_schema_cached.__wrapped__(key)
     
     def _format_tables_context(self, available_tables: List[Dict[str, Any]]) -> str:
         """Format available tables context for prompts."""
         if not available_tables:
             return "No tables available in the database."
         
-        context_parts = ["Available tables in the database:"]
-        
-        for table in available_tables:
-            table_info = [
-                f"- Table: {table.get('table_id', 'Unknown')}",
-                f"  Source: {table.get('source_file', 'Unknown')}",
-                f"  Rows: {table.get('rows', 0)}, Columns: {table.get('columns', 0)}"
-            ]
-            
-            if table.get('column_names'):
-                columns = table['column_names']
-                if isinstance(columns, str):
-                    import json
-                    try:
-                        columns = json.loads(columns)
-                    except:
-                        pass
-                table_info.append(f"  Columns: {', '.join(columns) if isinstance(columns, list) else columns}")
-            
-            if table.get('description'):
-                table_info.append(f"  Description: {table['description']}")
-            
-            context_parts.append("\n".join(table_info))
-        
-        return "\n\n".join(context_parts)
\ No newline at end of file
+        # The same table list is formatted for every query against a database,
+        # so the text is memoized on the fields it is built from
+        key = self._tables_context_key(available_tables)
+        try:
+            return _format_tables_context_cached(key)
+        except TypeError:
+            # Unhashable field values; format without the cache
+            return _format_tables_context_cached.__wrapped__(key)
+    
+    def _tables_vocabulary(self, available_tables: List[Dict[str, Any]]) -> frozenset:
+        """Content words describing the available tables, memoized like the tables context."""
+        key = self._tables_context_key(available_tables)
+        try:
+            return _tables_vocabulary(key)
+        except TypeError:
+            return _tables_vocabulary.__wrapped__(key)
+    
+    def _tables_context_key(self, available_tables: List[Dict[str, Any]]) -> tuple:
+        """Hashable summary of the table fields used in prompts."""
+        return tuple(
+            (
+                table.get('table_id', 'Unknown'),
+                table.get('source_file', 'Unknown'),
+                table.get('rows', 0),
+                table.get('columns', 0),
+                _normalize_column_names(table.get('column_names')),
+                table.get('description')
+            )
+            for table in available_tables
+        )
\ No newline at end of file
@@ -7,26 +7,53 @@ implementations.
 """
 
 import logging
-from typing import Dict, Any, Optional, Type, List
-from dataclasses import dataclass, field
+import functools
+import importlib
+import importlib.util
+from typing import Dict, Any, Optional, Type, List, Union
+from dataclasses import dataclass, field, fields
 
 from .llm_service import LLMService
 from .database_service import DatabaseService
-from .implementations.openai_llm_service import OpenAILLMService
-from .implementations.sqlite_database_service import SQLiteDatabaseService
-
-# Conditionally import private BHUB implementation
-try:
-    from .private.bhub_llm_service import BHubLLMService
-    _BHUB_AVAILABLE = True
-except ImportError:
-    _BHUB_AVAILABLE = False
-    BHubLLMService = None
+from ._compat import _DATACLASS_OPTIONS
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _module_available(module_path: str) -> bool:
+    """Check whether a module (relative to this package) can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(module_path, __package__) is not None
+    except ImportError:
+        return False
+
+
+# The private BHUB implementation is only registered where it is installed
+_BHUB_AVAILABLE = _module_available('.private.bhub_llm_service')
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_service_class(spec: Union[str, type]) -> type:
+    """
+    Resolve a registry entry to its class.
+    
+    Built-in services are registered as "module:Class" paths relative to this
+    package and imported on first use, so creating one service never loads the
+    others' dependencies. Classes registered directly are returned as-is.
+    """
+    if not isinstance(spec, str):
+        return spec
+    module_path, _, attr = spec.rpartition(':')
+    return getattr(importlib.import_module(module_path, __package__), attr)
+
+# Generic keys accepted by ServiceConfig.from_dict and the fields they set
+_SERVICE_CONFIG_ALIASES = {
+    'api_key': 'llm_api_key',
+    'model_id': 'llm_model_id',
+}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ServiceConfig:
     """Configuration for service creation."""
     
@@ -50,42 +77,36 @@ class ServiceConfig:
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'ServiceConfig':
         """Create ServiceConfig from dictionary."""
-        # Map common keys to our structure
-        mapped_config = {}
-        
-        # LLM configuration mapping
-        if 'api_key' in config_dict:
-            mapped_config['llm_api_key'] = config_dict['api_key']
-        if 'model_id' in config_dict:
-            mapped_config['llm_model_id'] = config_dict['model_id']
-        
-        # Database configuration mapping
-        if 'db_path' in config_dict:
-            mapped_config['db_path'] = config_dict['db_path']
-        
-        # Direct mapping for service-specific keys
-        for key, value in config_dict.items():
-            if key.startswith('llm_') or key.startswith('db_'):
-                mapped_config[key] = value
-        
-        # Create instance with mapped config
-        return cls(**{k: v for k, v in mapped_config.items() if k in cls.__dataclass_fields__})
+        # Generic aliases first, so explicit llm_/db_ keys take precedence
+        mapped_config = {
+            _SERVICE_CONFIG_ALIASES[key]: value
+            for key, value in config_dict.items() if key in _SERVICE_CONFIG_ALIASES
+        }
+        mapped_config.update(
+            (key, value) for key, value in config_dict.items() if key in _SERVICE_CONFIG_FIELDS
+        )
+        return cls(**mapped_config)
+
+
+_SERVICE_CONFIG_FIELDS = frozenset(f.name for f in fields(ServiceConfig))
 
 
 class ServiceFactory:
     """Factory for creating service instances."""
     
-    # Registry for custom service implementations
-    _llm_services: Dict[str, Type[LLMService]] = {
-        "openai": OpenAILLMService,
+    # Registry for custom service implementations. Registration replaces the
+    # dicts rather than mutating them, so lookups always see a consistent snapshot.
+    # Entries are classes or lazily imported "module:Class" paths.
+    _llm_services: Dict[str, Union[str, Type[LLMService]]] = {
+        "openai": ".implementations.openai_llm_service:OpenAILLMService",
     }
     
     # Add BHUB service if available (private implementation)
     if _BHUB_AVAILABLE:
-        _llm_services["bhub"] = BHubLLMService
+        _llm_services["bhub"] = ".private.bhub_llm_service:BHubLLMService"
     
-    _database_services: Dict[str, Type[DatabaseService]] = {
-        "sqlite": SQLiteDatabaseService,
+    _database_services: Dict[str, Union[str, Type[DatabaseService]]] = {
+        "sqlite": ".implementations.sqlite_database_service:SQLiteDatabaseService",
     }
     
     @classmethod
@@ -97,7 +118,7 @@ class ServiceFactory:
             name: Service name identifier
             service_class: Class implementing LLMService interface
         """
-        cls._llm_services[name] = service_class
+        cls._llm_services = {**cls._llm_services, name: service_class}
         logger.info(f"Registered LLM service: {name}")
     
     @classmethod
@@ -109,7 +130,7 @@ class ServiceFactory:
             name: Service name identifier
             service_class: Class implementing DatabaseService interface
         """
-        cls._database_services[name] = service_class
+        cls._database_services = {**cls._database_services, name: service_class}
         logger.info(f"Registered database service: {name}")
     
     @classmethod
@@ -132,13 +153,14 @@ class ServiceFactory:
         if service_type not in cls._llm_services:
             raise ValueError(f"Unknown LLM service type: {service_type}. Available: {list(cls._llm_services.keys())}")
         
-        service_class = cls._llm_services[service_type]
+        service_class = _resolve_service_class(cls._llm_services[service_type])
         
         # Build service-specific configuration
         service_config = {
             "api_key": config.llm_api_key,
             "model_id": config.llm_model_id,
             "timeout": config.llm_timeout,
+            "max_retries": config.llm_max_retries,
             **config.llm_extra_config
         }
         
@@ -183,7 +205,7 @@ class ServiceFactory:
         if service_type not in cls._database_services:
             raise ValueError(f"Unknown database service type: {service_type}. Available: {list(cls._database_services.keys())}")
         
-        service_class = cls._database_services[service_type]
+        service_class = _resolve_service_class(cls._database_services[service_type])
         
         # Build service-specific configuration
         service_config = {
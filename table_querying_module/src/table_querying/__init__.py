@@ -9,14 +9,35 @@ stores them in a database, and replaces table content with descriptions.
 __version__ = "1.0.0"
 __author__ = "CraftGraphRag Project"
 
-# Import main classes for easy access
-from .extractors import ExtractorFactory, ExtractorRouter
-from .schema_processor import SchemaProcessor  
-from .table_summarizer import TableSummarizer
-from .table_database import TableDatabase
-from .document_processor import DocumentProcessor
-from .table_processor import TableProcessor
-from .config import TableProcessingConfig, create_default_config, create_config_for_minecraft_wiki
+import importlib
+
+# Main classes for easy access, imported from their submodules on first use
+# (PEP 562) so importing the package does not load every dependency up front
+_LAZY_IMPORTS = {
+    'ExtractorFactory': '.extractors',
+    'ExtractorRouter': '.extractors',
+    'SchemaProcessor': '.schema_processor',
+    'TableSummarizer': '.table_summarizer',
+    'TableDatabase': '.table_database',
+    'DocumentProcessor': '.document_processor',
+    'TableProcessor': '.table_processor',
+    'TableProcessingConfig': '.config',
+    'create_default_config': '.config',
+    'create_config_for_minecraft_wiki': '.config',
+}
+
+
+def __getattr__(name):
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 # Define what gets imported with "from table_querying import *"
 __all__ = [
@@ -6,10 +6,54 @@ the table processing workflow.
 """
 
 import os
+import re
+import json
+import logging
+import functools
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_config_file(path: str, mtime_ns: int, size: int, inode: int) -> Dict[str, Any]:
+    """
+    Parse a JSON configuration file.
+    
+    Cached on the file's stat fingerprint (path, mtime_ns, size, inode) so
+    repeated loads of an unchanged file skip the read and parse, while files
+    replaced atomically (new inode) are re-read. Callers must not mutate the
+    returned dictionary.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ${VAR_NAME} references in configuration string values
+_ENV_VAR_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+
+def _replace_env_var(match: "re.Match") -> str:
+    """Substitute an environment variable, keeping the reference if it is unset."""
+    return os.environ.get(match.group(1), match.group(0))
+
+
+def _expand_env_vars(obj: Any) -> Any:
+    """Expand ${VAR_NAME} references in every string of a parsed JSON value."""
+    if isinstance(obj, str):
+        # Most values are plain literals; skip the regex for them
+        if '${' not in obj:
+            return obj
+        return _ENV_VAR_PATTERN.sub(_replace_env_var, obj)
+    elif isinstance(obj, dict):
+        return {key: _expand_env_vars(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [_expand_env_vars(item) for item in obj]
+    else:
+        return obj
+
 
 @dataclass
 class TableProcessingConfig:
@@ -47,73 +91,47 @@ class TableProcessingConfig:
         if not self.api_key:
             self.api_key = os.getenv("OPENAI_API_KEY") or os.getenv("API_KEY")
         
-        # Ensure paths are Path objects
-        self.output_dir = str(Path(self.output_dir).resolve())
-        self.db_path = str(Path(self.db_path).resolve())
+        # Make paths absolute; abspath is pure string work, unlike
+        # Path.resolve() which stats every component to follow symlinks
+        self.output_dir = os.path.abspath(self.output_dir)
+        self.db_path = os.path.abspath(self.db_path)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary."""
-        return {
-            'api_key': self.api_key,
-            'model_id': self.model_id,
-            'llm_service_type': self.llm_service_type,
-            'llm_base_url': self.llm_base_url,
-            'llm_organization': self.llm_organization,
-            'llm_timeout': self.llm_timeout,
-            'llm_max_retries': self.llm_max_retries,
-            'context_hint': self.context_hint,
-            'db_path': self.db_path,
-            'db_service_type': self.db_service_type,
-            'db_timeout': self.db_timeout,
-            'db_auto_commit': self.db_auto_commit,
-            'clear_database_on_start': self.clear_database_on_start,
-            'save_outputs': self.save_outputs,
-            'output_dir': self.output_dir,
-            'max_tables_per_document': self.max_tables_per_document,
-            'enable_schema_validation': self.enable_schema_validation,
-            'enable_description_generation': self.enable_description_generation
-        }
+        return {name: getattr(self, name) for name in _CONFIG_FIELD_NAMES}
     
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'TableProcessingConfig':
         """Create configuration from dictionary."""
-        return cls(**{k: v for k, v in config_dict.items() if hasattr(cls, k)})
+        known = {}
+        for key, value in config_dict.items():
+            if key in _CONFIG_FIELDS:
+                known[key] = value
+            elif not key.startswith('_'):
+                # Keys prefixed with '_' are comments (see config_template.json)
+                logger.warning(f"Ignoring unknown configuration key: {key}")
+        return cls(**known)
     
     @classmethod
     def from_file(cls, config_file: str) -> 'TableProcessingConfig':
         """Load configuration from JSON file."""
-        import json
-        import re
-        
-        config_path = Path(config_file)
-        if not config_path.exists():
+        try:
+            stat = os.stat(config_file)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file not found: {config_file}")
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-        
-        # Expand environment variables in string values
-        def expand_env_vars(obj):
-            if isinstance(obj, str):
-                # Replace ${VAR_NAME} with environment variable value
-                def replace_var(match):
-                    var_name = match.group(1)
-                    return os.getenv(var_name, match.group(0))  # Keep original if not found
-                return re.sub(r'\$\{([^}]+)\}', replace_var, obj)
-            elif isinstance(obj, dict):
-                return {key: expand_env_vars(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [expand_env_vars(item) for item in obj]
-            else:
-                return obj
+        # abspath is enough for the cache key: the inode and mtime already tell
+        # a replaced or edited file apart, without resolve()'s per-component stats
+        config_data = _read_config_file(
+            os.path.abspath(config_file), stat.st_mtime_ns, stat.st_size, stat.st_ino
+        )
         
-        config_data = expand_env_vars(config_data)
+        # Builds new containers, so the cached parse result is never modified
+        config_data = _expand_env_vars(config_data)
         return cls.from_dict(config_data)
     
     def save_to_file(self, config_file: str):
         """Save configuration to JSON file."""
-        import json
-        
         config_path = Path(config_file)
         config_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -121,6 +139,12 @@ class TableProcessingConfig:
             json.dump(self.to_dict(), f, indent=2)
 
 
+# Field names of TableProcessingConfig in declaration order, computed once at
+# import and shared by to_dict (ordering) and from_dict (membership)
+_CONFIG_FIELD_NAMES = tuple(f.name for f in fields(TableProcessingConfig))
+_CONFIG_FIELDS = frozenset(_CONFIG_FIELD_NAMES)
+
+
 def create_default_config() -> TableProcessingConfig:
     """Create a default configuration."""
     return TableProcessingConfig()
@@ -162,20 +186,39 @@ ENV_VAR_MAPPING = {
 }
 
 
+def _env_coercer(config_key: str):
+    """Pick the conversion for an environment value from the target field's type."""
+    field_type = _CONFIG_FIELD_TYPES.get(config_key)
+    if field_type is bool:
+        return lambda value: value.lower() == 'true'
+    if field_type in (int, float):
+        return field_type
+    return str
+
+
+_CONFIG_FIELD_TYPES = {f.name: f.type for f in fields(TableProcessingConfig)}
+
+# (env_var, config_key, coerce) built once from ENV_VAR_MAPPING, in precedence order
+_ENV_VAR_TABLE = tuple(
+    (env_var, config_key, _env_coercer(config_key))
+    for env_var, config_key in ENV_VAR_MAPPING.items()
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _config_from_env_values(values: tuple) -> Dict[str, Any]:
+    """Build the environment configuration from the raw values of _ENV_VAR_TABLE."""
+    config = {}
+    for (env_var, config_key, coerce), value in zip(_ENV_VAR_TABLE, values):
+        # Earlier variables win (e.g. OPENAI_API_KEY over the generic API_KEY)
+        if value and config_key not in config:
+            config[config_key] = coerce(value)
+    return config
+
+
 def load_config_from_env() -> Dict[str, Any]:
     """Load configuration from environment variables."""
-    config = {}
-    
-    for env_var, config_key in ENV_VAR_MAPPING.items():
-        value = os.getenv(env_var)
-        if value:
-            # Convert boolean strings
-            if value.lower() in ['true', 'false']:
-                value = value.lower() == 'true'
-            # Convert numeric strings
-            elif value.isdigit():
-                value = int(value)
-            
-            config[config_key] = value
-    
-    return config
\ No newline at end of file
+    # Keyed on the current values, so changes to os.environ are still seen
+    env = os.environ
+    values = tuple(env.get(env_var) for env_var, _, _ in _ENV_VAR_TABLE)
+    return dict(_config_from_env_values(values))
\ No newline at end of file
@@ -12,6 +12,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Header of a table description, as written by _format_table_description; the
+# description runs to the next blank line, the next "**Table", or the end
+_TABLE_REFERENCE_HEADER = re.compile(r'\*\*Table (\d+) Summary:\*\* ')
+_TABLE_REFERENCE_END = re.compile(r'\n\n|\*\*Table')
+
 
 class DocumentProcessor:
     """Handles document processing and table replacement."""
@@ -41,42 +46,38 @@ class DocumentProcessor:
             'replacement_details': []
         }
         
-        # Create a mapping from table position to description
-        position_to_description = {}
+        # Replace table chunks with their descriptions in a single pass
+        chunk_count = len(modified_chunks)
         for i, description_data in enumerate(descriptions):
-            if i < len(table_positions) and description_data.get("status") == "success":
-                table_pos = table_positions[i]
-                table_id = description_data.get("table_id", i + 1)
-                description = description_data.get("description", "No description available")
-                
-                position_to_description[table_pos] = {
-                    "table_id": table_id,
-                    "description": description,
-                    "original_length": len(markdown_chunks[table_pos]) if table_pos < len(markdown_chunks) else 0
-                }
-        
-        # Replace table chunks with their descriptions
-        for table_pos, desc_data in position_to_description.items():
-            if table_pos < len(modified_chunks):
-                original_content = modified_chunks[table_pos]
-                replacement_description = self._format_table_description(desc_data['description'], desc_data['table_id'])
-                
-                modified_chunks[table_pos] = replacement_description
-                
-                replacement_info['replacement_details'].append({
-                    'position': table_pos,
-                    'table_id': desc_data['table_id'],
-                    'original_length': desc_data['original_length'],
-                    'new_length': len(replacement_description),
-                    'status': 'success'
-                })
-                
-                replacement_info['successful_replacements'] += 1
-                
-                logger.info(f"Replaced table at position {table_pos} (Table ID {desc_data['table_id']}) "
-                          f"with description ({desc_data['original_length']} -> {len(replacement_description)} chars)")
-        
-        replacement_info['total_replacements'] = len(position_to_description)
+            if i >= len(table_positions) or description_data.get("status") != "success":
+                continue
+            replacement_info['total_replacements'] += 1
+            
+            table_pos = table_positions[i]
+            if table_pos >= chunk_count:
+                continue
+            
+            table_id = description_data.get("table_id", i + 1)
+            original_length = len(markdown_chunks[table_pos])
+            replacement_description = self._format_table_description(
+                description_data.get("description", "No description available"), table_id
+            )
+            
+            modified_chunks[table_pos] = replacement_description
+            
+            replacement_info['replacement_details'].append({
+                'position': table_pos,
+                'table_id': table_id,
+                'original_length': original_length,
+                'new_length': len(replacement_description),
+                'status': 'success'
+            })
+            
+            replacement_info['successful_replacements'] += 1
+            
+            logger.info(f"Replaced table at position {table_pos} (Table ID {table_id}) "
+                      f"with description ({original_length} -> {len(replacement_description)} chars)")
+        
         replacement_info['failed_replacements'] = len(table_positions) - replacement_info['successful_replacements']
         
         logger.info(f"Completed table replacement: {replacement_info['successful_replacements']} successful, "
@@ -189,17 +190,27 @@ class DocumentProcessor:
         Returns:
             List of table reference information
         """
-        # Pattern to match table description headers
-        table_pattern = r'\*\*Table (\d+) Summary:\*\* (.+?)(?=\n\n|\*\*Table|\Z)'
-        
-        matches = re.finditer(table_pattern, content, re.DOTALL)
-        
+        # Single forward scan: find a header, then the first terminator after
+        # at least one description character, and resume from there
         references = []
-        for match in matches:
-            table_id = int(match.group(1))
-            description = match.group(2).strip()
-            start_pos = match.start()
-            end_pos = match.end()
+        content_length = len(content)
+        position = 0
+        while True:
+            header = _TABLE_REFERENCE_HEADER.search(content, position)
+            if header is None:
+                break
+            
+            body_start = header.end()
+            if body_start >= content_length:
+                break
+            
+            terminator = _TABLE_REFERENCE_END.search(content, body_start + 1)
+            end_pos = terminator.start() if terminator else content_length
+            position = end_pos
+            
+            table_id = int(header.group(1))
+            description = content[body_start:end_pos].strip()
+            start_pos = header.start()
             
             references.append({
                 'table_id': table_id,
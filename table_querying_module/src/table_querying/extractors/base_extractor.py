@@ -31,9 +31,16 @@ class ExtractionResult:
 class BaseTableExtractor(ABC):
     """Abstract base class for all table extractors."""
     
+    logger = logging.getLogger("BaseTableExtractor")
+    
+    def __init_subclass__(cls, **kwargs):
+        """Bind one logger per extractor class instead of looking it up per instance."""
+        super().__init_subclass__(**kwargs)
+        cls.logger = logging.getLogger(cls.__name__)
+    
     def __init__(self):
         """Initialize the base extractor."""
-        self.logger = logging.getLogger(self.__class__.__name__)
+        pass
     
     @abstractmethod
     def extract_from_file(self, file_path: str) -> ExtractionResult:
@@ -19,7 +19,8 @@ logger = logging.getLogger(__name__)
 class ExtractorFactory:
     """Factory for creating and configuring table extractors."""
     
-    # Registry of available extractor classes
+    # Registry of available extractor classes. Treated as copy-on-write: mutations
+    # replace the dict wholesale so readers can iterate a snapshot without locking.
     _EXTRACTOR_REGISTRY = {
         'html': HTMLTableExtractor,
         'excel': ExcelTableExtractor,
@@ -41,21 +42,22 @@ class ExtractorFactory:
         """
         router = ExtractorRouter.__new__(ExtractorRouter)  # Create without calling __init__
         router.extractors = []
+        registry = ExtractorFactory._EXTRACTOR_REGISTRY
         
         # Determine which extractors to include
         if extractors is None:
             # Include all available extractors
-            extractor_names = list(ExtractorFactory._EXTRACTOR_REGISTRY.keys())
+            extractor_names = list(registry.keys())
         else:
             extractor_names = extractors
         
         # Create and add extractors
         for name in extractor_names:
-            if name not in ExtractorFactory._EXTRACTOR_REGISTRY:
-                available = ', '.join(ExtractorFactory._EXTRACTOR_REGISTRY.keys())
+            extractor_class = registry.get(name)
+            if extractor_class is None:
+                available = ', '.join(registry.keys())
                 raise ValueError(f"Unknown extractor: {name}. Available: {available}")
             
-            extractor_class = ExtractorFactory._EXTRACTOR_REGISTRY[name]
             extractor = extractor_class()
             router.extractors.append(extractor)
         
@@ -79,11 +81,11 @@ class ExtractorFactory:
         Raises:
             ValueError: If the extractor type is not recognized
         """
-        if extractor_type not in ExtractorFactory._EXTRACTOR_REGISTRY:
+        extractor_class = ExtractorFactory._EXTRACTOR_REGISTRY.get(extractor_type)
+        if extractor_class is None:
             available = ', '.join(ExtractorFactory._EXTRACTOR_REGISTRY.keys())
             raise ValueError(f"Unknown extractor type: {extractor_type}. Available: {available}")
         
-        extractor_class = ExtractorFactory._EXTRACTOR_REGISTRY[extractor_type]
         return extractor_class()
     
     @staticmethod
@@ -116,12 +118,13 @@ class ExtractorFactory:
         Returns:
             Dictionary with information about available extractors
         """
+        registry = ExtractorFactory._EXTRACTOR_REGISTRY
         info = {
-            'total_available': len(ExtractorFactory._EXTRACTOR_REGISTRY),
+            'total_available': len(registry),
             'extractors': {}
         }
         
-        for name, extractor_class in ExtractorFactory._EXTRACTOR_REGISTRY.items():
+        for name, extractor_class in registry.items():
             # Create temporary instance to get metadata
             temp_extractor = extractor_class()
             info['extractors'][name] = {
@@ -151,7 +154,7 @@ class ExtractorFactory:
         if name in ExtractorFactory._EXTRACTOR_REGISTRY:
             logger.warning(f"Overriding existing extractor registration: {name}")
         
-        ExtractorFactory._EXTRACTOR_REGISTRY[name] = extractor_class
+        ExtractorFactory._EXTRACTOR_REGISTRY = {**ExtractorFactory._EXTRACTOR_REGISTRY, name: extractor_class}
         logger.info(f"Registered extractor: {name} -> {extractor_class.__name__}")
     
     @staticmethod
@@ -166,7 +169,9 @@ class ExtractorFactory:
             True if extractor was found and removed, False otherwise
         """
         if name in ExtractorFactory._EXTRACTOR_REGISTRY:
-            del ExtractorFactory._EXTRACTOR_REGISTRY[name]
+            ExtractorFactory._EXTRACTOR_REGISTRY = {
+                key: value for key, value in ExtractorFactory._EXTRACTOR_REGISTRY.items() if key != name
+            }
             logger.info(f"Unregistered extractor: {name}")
             return True
         else:
@@ -48,9 +48,9 @@ class ExtractorRouter:
         """
         file_extension = Path(file_path).suffix.lower()
         
-        # Try fast lookup first
-        if file_extension in self._extension_mapping:
-            extractor = self._extension_mapping[file_extension]
+        # Try fast lookup first (single dict probe on the common path)
+        extractor = self._extension_mapping.get(file_extension)
+        if extractor is not None:
             logger.debug(f"Found extractor {extractor.get_extractor_name()} for {file_extension}")
             return extractor
         
@@ -100,11 +100,8 @@ class ExtractorRouter:
         Returns:
             Sorted list of all supported file extensions
         """
-        extensions = set()
-        for extractor in self.extractors:
-            extensions.update(extractor.get_supported_extensions())
-        
-        return sorted(list(extensions))
+        # The extension mapping already holds the union of all extensions
+        return sorted(self._extension_mapping)
     
     def is_supported_file(self, file_path: str) -> bool:
         """
@@ -153,12 +150,32 @@ class ExtractorRouter:
         Args:
             extractor: New extractor to add
         """
-        self.extractors.append(extractor)
+        self.extractors = self.extractors + [extractor]
         self._extension_mapping = self._build_extension_mapping()
         
         logger.info(f"Added extractor: {extractor.get_extractor_name()}")
         logger.debug(f"New supported extensions: {list(self._extension_mapping.keys())}")
     
+    def add_extractors(self, extractors: List[BaseTableExtractor]) -> None:
+        """
+        Add several extractors to the router at once.
+        
+        Unlike calling add_extractor() in a loop, the extension mapping is
+        rebuilt only once for the whole batch.
+        
+        Args:
+            extractors: Extractors to add, in priority order
+        """
+        if not extractors:
+            return
+        
+        self.extractors = self.extractors + list(extractors)
+        self._extension_mapping = self._build_extension_mapping()
+        
+        extractor_names = [ext.get_extractor_name() for ext in extractors]
+        logger.info(f"Added extractors: {extractor_names}")
+        logger.debug(f"New supported extensions: {list(self._extension_mapping.keys())}")
+    
     def remove_extractor(self, extractor_name: str) -> bool:
         """
         Remove an extractor by name.
@@ -7,6 +7,8 @@ with tables (HTML, Excel) using the complete table processing workflow.
 """
 
 import argparse
+import os
+import stat
 import sys
 import logging
 from pathlib import Path
@@ -124,24 +126,32 @@ def discover_supported_files(directory: str, recursive: bool = False) -> list:
     
     path = Path(directory)
     
-    if not path.exists():
+    # One stat() answers both "exists" and "is a directory"
+    try:
+        is_directory = stat.S_ISDIR(path.stat().st_mode)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Directory not found: {directory}")
     
-    if not path.is_dir():
+    if not is_directory:
         raise ValueError(f"Path is not a directory: {directory}")
     
     # Get supported extensions from the router
     router = ExtractorFactory.create_router()
-    supported_extensions = router.get_supported_extensions()
+    supported_extensions = tuple(router.get_supported_extensions())
     
+    # Walk the tree once with os.scandir (DirEntry caches the file type from
+    # readdir) instead of running one glob per extension.
     supported_files = []
-    for ext in supported_extensions:
-        # Remove the dot for glob pattern
-        ext_pattern = ext[1:] if ext.startswith('.') else ext
-        pattern = f"**/*.{ext_pattern}" if recursive else f"*.{ext_pattern}"
-        supported_files.extend(path.glob(pattern))
+    pending = [str(path)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(supported_extensions):
+                    supported_files.append(entry.path)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
     
-    return [str(f) for f in supported_files]
+    return supported_files
 
 
 def main():
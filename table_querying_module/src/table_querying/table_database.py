@@ -98,14 +98,15 @@ class TableDatabase:
         Returns:
             Session ID
         """
-        session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(source_file) % 10000}"
+        started_at = datetime.now()
+        session_id = f"session_{started_at.strftime('%Y%m%d_%H%M%S')}_{hash(source_file) % 10000}"
         
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO processing_sessions (session_id, source_file, metadata)
                 VALUES (?, ?, ?)
-            ''', (session_id, source_file, json.dumps({"started_at": datetime.now().isoformat()})))
+            ''', (session_id, source_file, json.dumps({"started_at": started_at.isoformat()})))
             conn.commit()
         
         logger.info(f"Started processing session {session_id} for {source_file}")
@@ -142,9 +143,7 @@ class TableDatabase:
                 
                 # Store table metadata
                 # Remove dataframe from schema for JSON serialization
-                schema_for_storage = schema.copy()
-                if 'dataframe' in schema_for_storage:
-                    del schema_for_storage['dataframe']
+                schema_for_storage = {k: v for k, v in schema.items() if k != 'dataframe'}
                 
                 cursor.execute('''
                     INSERT INTO tables (
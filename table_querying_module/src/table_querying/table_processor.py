@@ -279,12 +279,10 @@ class TableProcessor:
             schemas_path = self.output_dir / f"{base_name}_schemas.json"
             with open(schemas_path, 'w', encoding='utf-8') as f:
                 # Remove dataframe from schemas for JSON serialization
-                serializable_schemas = []
-                for schema in schemas:
-                    schema_copy = schema.copy()
-                    if 'dataframe' in schema_copy:
-                        del schema_copy['dataframe']
-                    serializable_schemas.append(schema_copy)
+                serializable_schemas = [
+                    {k: v for k, v in schema.items() if k != 'dataframe'}
+                    for schema in schemas
+                ]
                 json.dump(serializable_schemas, f, indent=2, ensure_ascii=False)
             output_files['schemas'] = str(schemas_path)
             
@@ -292,12 +290,11 @@ class TableProcessor:
             descriptions_path = self.output_dir / f"{base_name}_descriptions.json"
             with open(descriptions_path, 'w', encoding='utf-8') as f:
                 # Remove schema data for JSON serialization
-                serializable_descriptions = []
-                for desc in descriptions:
-                    desc_copy = desc.copy()
-                    if 'schema' in desc_copy and 'dataframe' in desc_copy['schema']:
-                        desc_copy['schema'] = {k: v for k, v in desc_copy['schema'].items() if k != 'dataframe'}
-                    serializable_descriptions.append(desc_copy)
+                serializable_descriptions = [
+                    {**desc, 'schema': {k: v for k, v in desc['schema'].items() if k != 'dataframe'}}
+                    if 'dataframe' in desc.get('schema', {}) else desc
+                    for desc in descriptions
+                ]
                 json.dump(serializable_descriptions, f, indent=2, ensure_ascii=False)
             output_files['descriptions'] = str(descriptions_path)
             
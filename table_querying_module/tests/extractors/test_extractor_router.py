@@ -161,6 +161,32 @@ class TestExtractorRouter(unittest.TestCase):
         extractor = self.router.get_extractor('file.test3')
         self.assertIsInstance(extractor, TestExtractor3)
     
+    def test_add_extractors(self):
+        """Test adding several extractors with a single mapping rebuild."""
+        class TestExtractor3(BaseTableExtractor):
+            def extract_from_file(self, file_path: str) -> ExtractionResult:
+                return ExtractionResult(
+                    source_file=file_path,
+                    tables_found=3,
+                    extraction_successful=True
+                )
+            
+            def supports_file_type(self, file_path: str) -> bool:
+                return Path(file_path).suffix.lower() == '.test3'
+            
+            def get_supported_extensions(self) -> list:
+                return ['.test3', '.test4']
+        
+        self.router.add_extractors([TestExtractor3()])
+        
+        self.assertEqual(len(self.router.extractors), 3)
+        self.assertIsInstance(self.router.get_extractor('file.test3'), TestExtractor3)
+        self.assertIsInstance(self.router.get_extractor('file.test4'), TestExtractor3)
+        
+        # An empty batch leaves the router untouched
+        self.router.add_extractors([])
+        self.assertEqual(len(self.router.extractors), 3)
+    
     def test_remove_extractor(self):
         """Test removing an extractor."""
         # Remove TestExtractor1
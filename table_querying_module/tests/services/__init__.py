@@ -0,0 +1 @@
+"""Tests for services package."""
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""Tests for the asyncio LLM service adapter."""
+
+import unittest
+import asyncio
+import threading
+import time
+
+from src.services.llm_service import LLMService, LLMResponse
+from src.services.async_llm_service import ThreadedAsyncLLMService
+
+
+class SlowLLMService(LLMService):
+    """LLM service that echoes prompts after a delay and records peak concurrency."""
+
+    def __init__(self, delays=None, **config):
+        super().__init__(**config)
+        self.delays = delays or {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def generate_completion(self, prompt: str, **kwargs) -> LLMResponse:
+        return self.generate_chat_completion([{"role": "user", "content": prompt}], **kwargs)
+
+    def generate_chat_completion(self, messages, **kwargs) -> LLMResponse:
+        content = messages[-1]['content']
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(content, 0.02))
+        finally:
+            with self._lock:
+                self.active -= 1
+        return LLMResponse(content=content, success=True)
+
+    def is_available(self) -> bool:
+        return True
+
+
+class TestThreadedAsyncLLMService(unittest.TestCase):
+    """Test cases for ThreadedAsyncLLMService."""
+
+    def test_batch_results_in_input_order(self):
+        """Test that results follow input order even when later prompts finish first."""
+        prompts = [f"prompt {i}" for i in range(6)]
+        # Earlier prompts take longest
+        service = SlowLLMService(delays={p: 0.06 - i * 0.01 for i, p in enumerate(prompts)})
+        async_service = ThreadedAsyncLLMService(service, max_concurrency=6)
+
+        try:
+            results = asyncio.run(async_service.generate_completions_batch(
+                prompts[:3] + [[{"role": "user", "content": p}] for p in prompts[3:]]
+            ))
+        finally:
+            async_service.close()
+
+        self.assertEqual([r.content for r in results], prompts)
+
+    def test_concurrency_bounded(self):
+        """Test that no more than max_concurrency requests run at once."""
+        service = SlowLLMService()
+        async_service = ThreadedAsyncLLMService(service, max_concurrency=3)
+
+        try:
+            results = asyncio.run(async_service.generate_completions_batch(
+                [f"prompt {i}" for i in range(12)]
+            ))
+        finally:
+            async_service.close()
+
+        self.assertEqual(len(results), 12)
+        self.assertLessEqual(service.max_active, 3)
+        self.assertGreater(service.max_active, 1)
+
+    def test_max_concurrency_from_service_config(self):
+        """Test that max_concurrency defaults to the wrapped service's config."""
+        async_service = ThreadedAsyncLLMService(SlowLLMService(max_concurrency=4))
+        async_service.close()
+
+        self.assertEqual(async_service.max_concurrency, 4)
+
+    def test_close_waits_for_in_flight_requests(self):
+        """Test that close() blocks until submitted requests have finished."""
+        service = SlowLLMService(delays={'slow': 0.1})
+        async_service = ThreadedAsyncLLMService(service, max_concurrency=2)
+        future = async_service._executor.submit(service.generate_completion, 'slow')
+
+        async_service.close()
+
+        self.assertTrue(future.done())
+        self.assertEqual(future.result().content, 'slow')
+
+
+if __name__ == '__main__':
+    unittest.main()
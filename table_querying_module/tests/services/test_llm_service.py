@@ -0,0 +1,155 @@
+"""Tests for the LLM service base class."""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+from unittest import mock
+
+from src.services.llm_service import LLMService, LLMResponse, coalesce_stream
+
+
+class MockLLMService(LLMService):
+    """LLM service that answers with the model name and counts calls."""
+    
+    def __init__(self, model_id: str = 'mock-model', **config):
+        super().__init__(**config)
+        self.model_id = model_id
+        self.calls = 0
+    
+    def generate_completion(self, prompt: str, **kwargs) -> LLMResponse:
+        return self.generate_chat_completion([{"role": "user", "content": prompt}], **kwargs)
+    
+    def generate_chat_completion(self, messages, **kwargs) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(content=f"{self.model_id}: {messages[-1]['content'][:20]}", success=True)
+    
+    def is_available(self) -> bool:
+        return True
+
+
+class TestLLMServiceCache(unittest.TestCase):
+    """Test cases for the convenience-method response caches."""
+    
+    def setUp(self):
+        """Set up a temporary cache directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, 'llm_cache.db')
+        
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_persistent_cache_reused_across_services(self):
+        """Test that a new service instance reads earlier responses from disk."""
+        first = MockLLMService(persistent_cache_path=self.cache_path)
+        first.generate_table_description({'table_id': 'table_1'})
+        
+        second = MockLLMService(persistent_cache_path=self.cache_path)
+        response = second.generate_table_description({'table_id': 'table_1'})
+        
+        self.assertTrue(response.metadata.get('cached'))
+        self.assertEqual(second.calls, 0)
+    
+    def test_persistent_cache_keyed_on_model(self):
+        """Test that switching models does not return another model's answer."""
+        MockLLMService('gpt-3.5-turbo', persistent_cache_path=self.cache_path).generate_table_description(
+            {'table_id': 'table_1'}
+        )
+        
+        service = MockLLMService('gpt-4', persistent_cache_path=self.cache_path)
+        response = service.generate_table_description({'table_id': 'table_1'})
+        
+        self.assertFalse(response.metadata.get('cached', False))
+        self.assertEqual(service.calls, 1)
+        self.assertTrue(response.content.startswith('gpt-4'))
+
+    
+    def test_batch_duplicates_dispatched_once_as_separate_objects(self):
+        """Test that repeated prompts in a batch share one call but not one response object."""
+        for cache_size in (128, 0):
+            service = MockLLMService(prompt_cache_size=cache_size)
+            responses = service.generate_table_descriptions_batch(
+                [{'table_id': 'table_1'}, {'table_id': 'table_2'}, {'table_id': 'table_1'}]
+            )
+            
+            self.assertEqual(service.calls, 2)
+            self.assertEqual(responses[0].content, responses[2].content)
+            responses[0].metadata['seen'] = True
+            self.assertNotIn('seen', responses[2].metadata)
+
+
+class TestFeasibilityPrefilter(unittest.TestCase):
+    """Test cases for the local analyze_query_feasibility prefilter."""
+    
+    TABLES = [{
+        'table_id': 'table_3',
+        'source_file': 'crafting.html',
+        'column_names': '["Recipe", "Ingredients", "Output"]',
+        'description': 'Crafting recipes and their outputs'
+    }]
+    
+    def setUp(self):
+        """Set up a service with the prefilter enabled."""
+        self.service = MockLLMService(feasibility_prefilter=True, prompt_cache_size=0)
+    
+    def assert_sent_to_model(self, query):
+        response = self.service.analyze_query_feasibility(query, self.TABLES)
+        self.assertNotIn('shortcircuit', response.metadata, query)
+    
+    def test_aggregate_queries_reach_the_model(self):
+        """Test that generic aggregate questions are not rejected locally."""
+        for query in ("count entries", "what is the average?", "How many rows are there?",
+                      "Show the top 5 by total", "sort the items by value"):
+            self.assert_sent_to_model(query)
+        self.assertEqual(self.service.calls, 5)
+    
+    def test_plural_query_words_match_table_vocabulary(self):
+        """Test that plurals match singular column names and vice versa."""
+        for query in ("list all recipes", "which ingredient is used most?", "outputs of recipe 3"):
+            self.assert_sent_to_model(query)
+    
+    def test_unrelated_query_short_circuits(self):
+        """Test that a query about something absent from every table skips the model."""
+        response = self.service.analyze_query_feasibility("What's the weather today?", self.TABLES)
+        
+        self.assertTrue(response.metadata.get('shortcircuit'))
+        self.assertEqual(self.service.calls, 0)
+        analysis = json.loads(response.content)
+        self.assertFalse(analysis['is_fulfillable'])
+        self.assertLessEqual(analysis['confidence'], 0.5)
+    
+    def test_prefilter_off_by_default(self):
+        """Test that without the option every query goes to the model."""
+        service = MockLLMService(prompt_cache_size=0)
+        response = service.analyze_query_feasibility("What's the weather today?", self.TABLES)
+        
+        self.assertNotIn('shortcircuit', response.metadata)
+        self.assertEqual(service.calls, 1)
+
+
+
+class TestCoalesceStream(unittest.TestCase):
+    """Test cases for merging streamed deltas."""
+    
+    def test_flushes_after_interval(self):
+        """Test that deltas are joined until flush_interval has passed, and the rest flushed at the end."""
+        # Start, then one clock reading per non-empty delta
+        times = [0.0, 0.05, 0.1, 0.15, 0.25, 0.3]
+        with mock.patch('src.services.llm_service.time.monotonic', side_effect=times):
+            pieces = list(coalesce_stream(iter(['a', '', 'b', 'c', '', 'd', 'e']), flush_interval=0.1))
+        
+        self.assertEqual(pieces, ['ab', 'cd', 'e'])
+    
+    def test_zero_interval_passes_deltas_through(self):
+        """Test that a zero interval yields every non-empty delta on its own."""
+        self.assertEqual(list(coalesce_stream(iter(['a', '', 'b', 'c']), flush_interval=0)), ['a', 'b', 'c'])
+    
+    def test_empty_stream(self):
+        """Test that a stream of empty deltas yields nothing."""
+        self.assertEqual(list(coalesce_stream(iter(['', '']))), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,364 @@
+"""Tests for the OpenAI LLM service."""
+
+import unittest
+import json
+from unittest import mock
+
+import requests
+
+from src.services.implementations.openai_llm_service import OpenAILLMService
+
+
+def make_response(status_code=200, body=None, headers=None, text=None):
+    """Build a requests.Response with the given status, JSON body and headers."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = 'https://api.test/v1'
+    if text is None:
+        text = json.dumps(body if body is not None else {})
+    response._content = text.encode('utf-8')
+    response._content_consumed = True
+    response.headers.update(headers or {})
+    return response
+
+
+def completion_body(content='answer'):
+    """Chat completions response body with a single choice."""
+    return {'id': 'resp', 'choices': [{'message': {'content': content}, 'finish_reason': 'stop'}]}
+
+
+class TestOpenAIRetry(unittest.TestCase):
+    """Test cases for retrying rate-limited and failed requests."""
+
+    def setUp(self):
+        """Set up a service whose session and sleeps are mocked."""
+        self.service = OpenAILLMService(api_key='test-key', base_url='https://api.test/v1',
+                                        cache_size=0, retry_base_delay=1.0, retry_max_delay=30.0)
+        self.service._session = mock.Mock()
+
+        sleep_patcher = mock.patch('src.services.implementations.openai_llm_service.time.sleep')
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+        uniform_patcher = mock.patch('src.services.implementations.openai_llm_service.random.uniform',
+                                     return_value=0.5)
+        self.uniform = uniform_patcher.start()
+        self.addCleanup(uniform_patcher.stop)
+
+    def test_rate_limited_then_success(self):
+        """Test that a 429 is retried and the later completion returned."""
+        self.service._session.post.side_effect = [
+            make_response(429), make_response(200, completion_body('ok'))
+        ]
+
+        response = self.service.generate_chat_completion([{'role': 'user', 'content': 'hi'}])
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.content, 'ok')
+        self.assertEqual(self.service._session.post.call_count, 2)
+        self.sleep.assert_called_once_with(0.5)
+
+    def test_retry_after_honoured(self):
+        """Test that a Retry-After longer than the backoff sets the delay."""
+        self.service._session.post.side_effect = [
+            make_response(429, headers={'Retry-After': '7'}),
+            make_response(503, headers={'Retry-After': '120'}),
+            make_response(200, completion_body())
+        ]
+
+        response = self.service.generate_chat_completion([{'role': 'user', 'content': 'hi'}])
+
+        self.assertTrue(response.success)
+        # The second Retry-After is capped at retry_max_delay
+        self.assertEqual([c.args[0] for c in self.sleep.call_args_list], [7.0, 30.0])
+        # Jitter range doubles per attempt
+        self.assertEqual([c.args for c in self.uniform.call_args_list], [(0, 1.0), (0, 2.0)])
+
+    def test_retries_exhausted_returns_last_response(self):
+        """Test that the final rate-limited response is returned once retries run out."""
+        self.service.max_retries = 2
+        last = make_response(429)
+        self.service._session.post.side_effect = [make_response(429), make_response(429), last]
+
+        response = self.service._post_with_retry('https://api.test/v1/chat/completions', data=b'{}')
+
+        self.assertIs(response, last)
+        self.assertEqual(self.service._session.post.call_count, 3)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_max_retries_zero(self):
+        """Test that max_retries=0 sends a single request and never sleeps."""
+        self.service.max_retries = 0
+        self.service._session.post.side_effect = [make_response(429)]
+
+        response = self.service.generate_chat_completion([{'role': 'user', 'content': 'hi'}])
+
+        self.assertFalse(response.success)
+        self.assertEqual(self.service._session.post.call_count, 1)
+        self.sleep.assert_not_called()
+
+    def test_connection_error_retried(self):
+        """Test that a failed connection is retried."""
+        self.service._session.post.side_effect = [
+            requests.exceptions.ConnectionError('refused'), make_response(200, completion_body())
+        ]
+
+        response = self.service.generate_chat_completion([{'role': 'user', 'content': 'hi'}])
+
+        self.assertTrue(response.success)
+        self.assertEqual(self.service._session.post.call_count, 2)
+
+    def test_read_timeout_not_retried_for_non_idempotent(self):
+        """Test that a read timeout on a non-idempotent request is raised, not retried."""
+        self.service._session.post.side_effect = [
+            requests.exceptions.ReadTimeout('slow'), make_response(200)
+        ]
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.service._post_with_retry('https://api.test/v1/batches', idempotent=False, json={})
+        self.assertEqual(self.service._session.post.call_count, 1)
+
+    def test_connect_timeout_retried_for_non_idempotent(self):
+        """Test that a connect timeout is retried even for non-idempotent requests."""
+        ok = make_response(200)
+        self.service._session.post.side_effect = [requests.exceptions.ConnectTimeout('slow'), ok]
+
+        response = self.service._post_with_retry('https://api.test/v1/batches', idempotent=False, json={})
+
+        self.assertIs(response, ok)
+
+    def test_submit_batch_does_not_retry_read_timeout(self):
+        """Test that batch creation is not repeated after a read timeout."""
+        self.service._session.post.side_effect = [
+            make_response(200, {'id': 'file-1'}),
+            requests.exceptions.ReadTimeout('slow'),
+            make_response(200, {'id': 'batch-1'})
+        ]
+
+        self.assertIsNone(self.service.submit_batch(['a', 'b']))
+        self.assertEqual(self.service._session.post.call_count, 2)
+
+
+class TestOpenAIResponseCache(unittest.TestCase):
+    """Test cases for the deterministic-request response cache."""
+
+    def setUp(self):
+        """Set up a caching service with a mocked session."""
+        self.service = OpenAILLMService(api_key='test-key', base_url='https://api.test/v1', cache_size=8)
+        self.service._session = mock.Mock()
+        self.service._session.post.side_effect = lambda *args, **kwargs: make_response(200, completion_body())
+        self.messages = [{'role': 'user', 'content': 'hi'}]
+
+    def test_zero_temperature_cached(self):
+        """Test that repeated temperature 0 requests are answered from the cache."""
+        self.service.generate_chat_completion(self.messages, temperature=0)
+        response = self.service.generate_chat_completion(self.messages, temperature=0)
+
+        self.assertTrue(response.metadata.get('cached'))
+        self.assertEqual(self.service._session.post.call_count, 1)
+
+    def test_none_temperature_not_cached(self):
+        """Test that temperature=None is sent uncached instead of failing."""
+        first = self.service.generate_chat_completion(self.messages, temperature=None)
+        second = self.service.generate_chat_completion(self.messages, temperature=None)
+
+        self.assertTrue(first.success)
+        self.assertTrue(second.success)
+        self.assertEqual(self.service._session.post.call_count, 2)
+
+
+class TestOpenAIStreaming(unittest.TestCase):
+    """Test cases for parsing streamed server-sent events."""
+
+    def setUp(self):
+        """Set up a service whose streamed response is mocked."""
+        self.service = OpenAILLMService(api_key='test-key', base_url='https://api.test/v1',
+                                        stream_flush_interval=0)
+        self.service._session = mock.Mock()
+        self.response = mock.MagicMock()
+        self.response.__enter__.return_value = self.response
+        self.service._session.post.return_value = self.response
+        self.messages = [{'role': 'user', 'content': 'hi'}]
+
+    def set_lines(self, lines):
+        """Serve lines from iter_lines, recording whether all were read."""
+        self.consumed = False
+
+        def iter_lines():
+            yield from lines
+            self.consumed = True
+        self.response.iter_lines.side_effect = iter_lines
+
+    @staticmethod
+    def delta_line(delta, prefix=b'data: '):
+        """SSE data line carrying a chunk with the given delta."""
+        return prefix + json.dumps({'choices': [{'delta': delta}]}).encode('utf-8')
+
+    def test_parses_data_lines(self):
+        """Test that content deltas are extracted and other lines ignored."""
+        self.set_lines([
+            b': keep-alive',
+            b'',
+            b'event: message',
+            self.delta_line({'role': 'assistant'}),
+            self.delta_line({'content': 'Hel'}, prefix=b'data:'),
+            self.delta_line({'content': 'lo'}),
+            b'data: {"choices": []}',
+            self.delta_line({'content': None}),
+            b'data: [DONE]',
+        ])
+
+        self.assertEqual(list(self.service._stream_deltas(self.messages)), ['', 'Hel', 'lo', '', ''])
+        self.assertEqual(list(self.service.generate_chat_completion_stream(self.messages)), ['Hel', 'lo'])
+        self.assertTrue(self.service._session.post.call_args.kwargs['stream'])
+
+    def test_reads_past_done(self):
+        """Test that the body is read to the end after [DONE] so the connection is reused."""
+        self.set_lines([self.delta_line({'content': 'ok'}), b'data: [DONE]', b''])
+
+        self.assertEqual(list(self.service.generate_chat_completion_stream(self.messages)), ['ok'])
+        self.assertTrue(self.consumed)
+
+    def test_malformed_event_raises(self):
+        """Test that an undecodable data line surfaces as a RuntimeError."""
+        self.set_lines([self.delta_line({'content': 'ok'}), b'data: {not json'])
+
+        with self.assertRaises(RuntimeError):
+            list(self.service.generate_chat_completion_stream(self.messages))
+
+    def test_http_error_raises(self):
+        """Test that an error status surfaces as a RuntimeError before any text."""
+        self.response.status_code = 400
+        self.response.raise_for_status.side_effect = requests.exceptions.HTTPError('400')
+
+        with self.assertRaises(RuntimeError):
+            list(self.service.generate_chat_completion_stream(self.messages))
+
+
+class TestOpenAIBatch(unittest.TestCase):
+    """Test cases for submitting and collecting Batch API jobs."""
+
+    def setUp(self):
+        """Set up a service whose session and sleeps are mocked."""
+        self.service = OpenAILLMService(api_key='test-key', base_url='https://api.test/v1', cache_size=0)
+        self.service._session = mock.Mock()
+        self.batch = {'id': 'batch-1', 'status': 'completed', 'output_file_id': 'file-out',
+                      'request_counts': {'total': 3}}
+        self.statuses = None
+        self.output_lines = []
+        self.service._session.get.side_effect = self.fake_get
+
+        sleep_patcher = mock.patch('src.services.implementations.openai_llm_service.time.sleep')
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def fake_get(self, url, **kwargs):
+        """Answer batch status and output file requests."""
+        if url.endswith('/batches/batch-1'):
+            if self.statuses is not None:
+                self.batch['status'] = next(self.statuses)
+            return make_response(200, self.batch)
+        if url.endswith('/files/file-out/content'):
+            return make_response(200, text='\n'.join(json.dumps(line) for line in self.output_lines))
+        return make_response(404)
+
+    @staticmethod
+    def output_line(index, content=None, error=None):
+        """Output file record for the request with the given custom_id."""
+        if error is not None:
+            return {'custom_id': str(index), 'response': {'status_code': 400, 'body': {'error': error}},
+                    'error': None}
+        return {'custom_id': str(index), 'response': {'status_code': 200, 'body': completion_body(content)},
+                'error': None}
+
+    def test_submit_batch(self):
+        """Test that prompts are uploaded with their index as custom_id and the batch created."""
+        self.service._session.post.side_effect = [
+            make_response(200, {'id': 'file-in'}), make_response(200, {'id': 'batch-1'})
+        ]
+
+        batch_id = self.service.submit_batch(['first', [{'role': 'user', 'content': 'second'}]])
+
+        self.assertEqual(batch_id, 'batch-1')
+        upload, create = self.service._session.post.call_args_list
+        self.assertTrue(upload.args[0].endswith('/files'))
+        lines = [json.loads(line) for line in upload.kwargs['files']['file'][1].splitlines()]
+        self.assertEqual([line['custom_id'] for line in lines], ['0', '1'])
+        self.assertEqual(lines[1]['body']['messages'], [{'role': 'user', 'content': 'second'}])
+        self.assertEqual(create.kwargs['json']['input_file_id'], 'file-in')
+
+    def test_results_in_submission_order(self):
+        """Test that out-of-order output records are mapped back by custom_id."""
+        self.output_lines = [self.output_line(2, 'c'), self.output_line(0, 'a'), self.output_line(1, 'b')]
+
+        results = self.service.wait_for_batch('batch-1')
+
+        self.assertEqual([r.content for r in results], ['a', 'b', 'c'])
+        self.assertTrue(all(r.success for r in results))
+
+    def test_partial_failures(self):
+        """Test that failed and missing requests become failed responses in place."""
+        self.output_lines = [self.output_line(0, 'a'), self.output_line(2, error={'message': 'bad'})]
+
+        results = self.service.wait_for_batch('batch-1')
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].content, 'a')
+        self.assertFalse(results[1].success)
+        self.assertEqual(results[1].error, 'Request not completed in batch')
+        self.assertFalse(results[2].success)
+        self.assertIn('bad', results[2].error)
+
+    def test_polls_until_completed(self):
+        """Test that an in-progress batch is polled with a growing delay."""
+        self.statuses = iter(['validating', 'in_progress', 'completed'])
+        self.output_lines = [self.output_line(i, str(i)) for i in range(3)]
+
+        results = self.service.wait_for_batch('batch-1', poll_interval=1.0)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual([c.args[0] for c in self.sleep.call_args_list], [1.0, 2.0])
+
+    def test_expired_batch_returns_partial_results(self):
+        """Test that an expired batch still returns the requests it completed."""
+        self.batch['status'] = 'expired'
+        self.output_lines = [self.output_line(1, 'b')]
+
+        results = self.service.wait_for_batch('batch-1')
+
+        self.assertEqual([r.success for r in results], [False, True, False])
+        self.assertEqual(results[1].content, 'b')
+
+    def test_failed_batch_returns_empty(self):
+        """Test that a failed batch returns no results."""
+        self.batch['status'] = 'failed'
+
+        self.assertEqual(self.service.wait_for_batch('batch-1'), [])
+
+    def test_timeout_cancels_batch(self):
+        """Test that giving up on a batch cancels it."""
+        self.batch['status'] = 'in_progress'
+        self.service._session.post.return_value = make_response(200, {'id': 'batch-1', 'status': 'cancelling'})
+
+        results = self.service.wait_for_batch('batch-1', poll_interval=5.0, max_wait=1.0)
+
+        self.assertEqual(results, [])
+        self.service._session.post.assert_called_once()
+        self.assertTrue(self.service._session.post.call_args.args[0].endswith('/batches/batch-1/cancel'))
+
+    def test_generate_completions_batch(self):
+        """Test the Batch API route of generate_completions_batch end to end."""
+        self.service.use_batch_api = True
+        self.service._session.post.side_effect = [
+            make_response(200, {'id': 'file-in'}), make_response(200, {'id': 'batch-1'})
+        ]
+        self.batch['request_counts'] = {'total': 2}
+        self.output_lines = [self.output_line(1, 'b'), self.output_line(0, 'a')]
+
+        results = self.service.generate_completions_batch(['first', 'second'])
+
+        self.assertEqual([r.content for r in results], ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,309 @@
+"""Tests for the SQLite database service."""
+
+import unittest
+import tempfile
+import shutil
+import threading
+import sqlite3
+import math
+import os
+from collections.abc import Iterator
+
+from src.services import _compat
+from src.services.implementations.sqlite_database_service import SQLiteDatabaseService
+
+
+def make_table(table_id='table_1', source_file='page.html', rows=None, description='Sword stats'):
+    """Build a table_data dict as passed to store_table."""
+    rows = rows if rows is not None else [{'Item': 'Sword', 'Damage': 7}, {'Item': 'Axe', 'Damage': 9}]
+    return {
+        'table_id': table_id,
+        'source_file': source_file,
+        'rows': len(rows),
+        'columns': 2,
+        'column_names': ['Item', 'Damage'],
+        'column_types': {'Item': 'object', 'Damage': 'int64'},
+        'description': description,
+        'row_data': rows
+    }
+
+
+def create_legacy_backup(path):
+    """Write a database with the schema used before content hashes, counters and FTS."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE tables (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_id TEXT UNIQUE NOT NULL,
+            source_file TEXT NOT NULL,
+            rows INTEGER NOT NULL,
+            columns INTEGER NOT NULL,
+            column_names TEXT NOT NULL,
+            column_types TEXT NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE table_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_id TEXT NOT NULL,
+            row_index INTEGER NOT NULL,
+            row_data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE processing_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT UNIQUE NOT NULL,
+            source_file TEXT NOT NULL,
+            total_tables INTEGER DEFAULT 0,
+            successful_tables INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO tables (table_id, source_file, rows, columns, column_names, column_types, description)
+        VALUES ('legacy_1', 'old.html', 1, 1, '["Mob"]', '{"Mob": "object"}', 'Hostile mobs');
+        INSERT INTO table_data (table_id, row_index, row_data) VALUES ('legacy_1', 0, '{"Mob": "Zombie"}');
+        INSERT INTO processing_sessions (session_id, source_file) VALUES ('s1', 'old.html');
+    """)
+    conn.commit()
+    conn.close()
+
+
+class TestSQLiteDatabaseService(unittest.TestCase):
+    """Test cases for SQLiteDatabaseService."""
+    
+    def setUp(self):
+        """Set up a fresh database."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.service = SQLiteDatabaseService(self.db_path)
+        self.assertTrue(self.service.initialize())
+        self.session_id = self.service.create_session('page.html')
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.service.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_connections_closed_when_threads_exit(self):
+        """Test that short-lived threads do not leave connections open."""
+        results = []
+        
+        def worker():
+            results.append(len(self.service.get_all_tables()))
+        
+        threads = [threading.Thread(target=worker) for _ in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(results, [0] * 50)
+        # Only the test thread's connection remains
+        self.assertEqual(len(self.service._connections), 1)
+    
+    def test_threads_use_separate_connections(self):
+        """Test that each thread gets its own connection."""
+        connections = []
+        barrier = threading.Barrier(4)
+        
+        def worker():
+            connections.append(self.service._get_connection())
+            barrier.wait()
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len({id(conn) for conn in connections}), 4)
+
+    
+    def _row_ids(self, table_id):
+        with self.service._get_connection() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT id FROM table_data WHERE table_id = ? ORDER BY row_index", (table_id,)
+            )]
+    
+    def test_store_unchanged_table_keeps_rows(self):
+        """Test that storing identical content again does not rewrite the rows."""
+        self.assertTrue(self.service.store_table(make_table(), self.session_id))
+        row_ids = self._row_ids('table_1')
+        
+        self.assertTrue(self.service.store_table(make_table(description='Updated'), self.session_id))
+        
+        self.assertEqual(self._row_ids('table_1'), row_ids)
+        self.assertEqual(self.service.get_table_metadata('table_1').description, 'Updated')
+    
+    def test_store_changed_table_rewrites_rows(self):
+        """Test that changed content replaces the stored rows."""
+        self.assertTrue(self.service.store_table(make_table(), self.session_id))
+        row_ids = self._row_ids('table_1')
+        
+        new_rows = [{'Item': 'Trident', 'Damage': 9}]
+        self.assertTrue(self.service.store_table(make_table(rows=new_rows), self.session_id))
+        
+        self.assertNotEqual(self._row_ids('table_1'), row_ids)
+        result = self.service.get_table_data('table_1')
+        self.assertEqual([row['Item'] for row in result.data], ['Trident'])
+    
+    def test_fts_search_matches_like_search(self):
+        """Test that the FTS5 search returns what the LIKE scan returns."""
+        tables = [
+            make_table('table_1', 'swords.html', description='Sword damage and durability'),
+            make_table('table_2', 'mobs.html', description='Hostile mobs, 100% spawn rate'),
+            make_table('table_3', 'quotes.html', description='The "Notch" apple recipe'),
+            make_table('table_4', 'blocks_list.html', description='Block hardness')
+        ]
+        for table in tables:
+            self.assertTrue(self.service.store_table(table, self.session_id))
+        self.assertTrue(self.service._has_search_index())
+        
+        terms = ['sword', 'SWORD', 'Durab', 'ob', 'x', '100%', 'blocks_', '_list', '%',
+                 '"Notch"', 'Notch" apple', '"', 'table_', 'html', 'no such thing']
+        for term in terms:
+            self.service._fts_enabled = True
+            fts = [t.table_id for t in self.service.search_tables(term)]
+            self.service._fts_enabled = False
+            like = [t.table_id for t in self.service.search_tables(term)]
+            self.assertEqual(sorted(fts), sorted(like), term)
+        
+        self.service._fts_enabled = True
+        self.assertEqual([t.table_id for t in self.service.search_tables('Notch')], ['table_3'])
+        self.assertEqual(
+            [t.table_id for t in self.service.search_tables('sword', ['description'])], ['table_1']
+        )
+    
+    def test_stats_counters_follow_writes(self):
+        """Test counters after inserting, moving and deleting tables."""
+        def counters():
+            summary = self.service.get_database_summary()
+            return summary['total_tables'], summary['unique_source_files']
+        
+        self.service.store_table(make_table('table_1', 'a.html'), self.session_id)
+        self.service.store_table(make_table('table_2', 'a.html'), self.session_id)
+        self.service.store_table(make_table('table_3', 'b.html'), self.session_id)
+        self.assertEqual(counters(), (3, 2))
+        
+        # Moving the only table of b.html to a.html drops a source
+        self.service.store_table(make_table('table_3', 'a.html'), self.session_id)
+        self.assertEqual(counters(), (3, 1))
+        
+        # Moving a table to a new source adds one
+        self.service.store_table(make_table('table_1', 'c.html'), self.session_id)
+        self.assertEqual(counters(), (3, 2))
+        
+        with self.service._get_connection() as conn:
+            conn.execute("DELETE FROM tables WHERE table_id = 'table_1'")
+        self.assertEqual(counters(), (2, 1))
+        
+        with self.service._get_connection() as conn:
+            exact = conn.execute("SELECT COUNT(*), COUNT(DISTINCT source_file) FROM tables").fetchone()
+        self.assertEqual(counters(), tuple(exact))
+    
+    def test_summary_invalidated_by_writes(self):
+        """Test that the cached summary reflects writes from this and other connections."""
+        first = self.service.get_database_summary()
+        self.assertEqual((first['total_tables'], first['total_rows']), (0, 0))
+        
+        self.service.store_table(make_table(), self.session_id)
+        second = self.service.get_database_summary()
+        self.assertEqual((second['total_tables'], second['total_rows']), (1, 2))
+        
+        # Returned summaries are copies of the cached one
+        second['total_tables'] = 99
+        self.assertEqual(self.service.get_database_summary()['total_tables'], 1)
+        
+        # A write made outside the service is picked up from the file fingerprint
+        other = sqlite3.connect(self.db_path)
+        other.execute("INSERT INTO processing_sessions (session_id, source_file) VALUES ('external', 'x.html')")
+        other.commit()
+        other.close()
+        self.assertEqual(self.service.get_database_summary()['total_sessions'], 2)
+        
+        self.assertTrue(self.service.clear_database())
+        self.assertEqual(self.service.get_database_summary()['total_tables'], 0)
+    
+    def test_iter_table_schemas_matches_all_tables(self):
+        """Test that streamed schemas match get_all_tables and skip undecodable metadata."""
+        for i in range(3):
+            self.assertTrue(self.service.store_table(make_table(f'table_{i}'), self.session_id))
+        with self.service._get_connection() as conn:
+            conn.execute("UPDATE tables SET column_names = 'not json' WHERE table_id = 'table_1'")
+        
+        schemas = self.service.iter_table_schemas()
+        self.assertIsInstance(schemas, Iterator)
+        schemas = list(schemas)
+        self.assertEqual(schemas, [table.to_dict() for table in self.service.get_all_tables()])
+        self.assertEqual(sorted(schema['table_id'] for schema in schemas), ['table_0', 'table_2'])
+        self.assertEqual(self.service.get_database_schema()['tables'], schemas)
+    
+    def test_non_finite_cells_stored_as_null(self):
+        """Test that NaN cells are stored as JSON null, with or without orjson."""
+        row = {'Item': 'Bow', 'Damage': float('nan'), 'Range': [1.5, float('inf')]}
+        self.assertEqual(
+            _compat._json_dumps_stdlib(row),
+            '{"Item":"Bow","Damage":null,"Range":[1.5,null]}'
+        )
+        self.assertEqual(_compat._json_dumps(row), _compat._json_dumps_stdlib(row))
+        
+        self.assertTrue(self.service.store_table(make_table(rows=[row]), self.session_id))
+        result = self.service.execute_query(
+            "SELECT json_extract(row_data, '$.Damage') AS damage FROM table_data WHERE table_id = 'table_1'"
+        )
+        self.assertTrue(result.success)
+        self.assertEqual(result.data, [{'damage': None}])
+    
+    def test_legacy_non_finite_rows_still_readable(self):
+        """Test that rows stored with bare NaN/Infinity tokens are read back, not skipped."""
+        self.assertTrue(self.service.store_table(make_table(), self.session_id))
+        with self.service._get_connection() as conn:
+            conn.execute(
+                "UPDATE table_data SET row_data = ? WHERE table_id = 'table_1' AND row_index = 0",
+                ('{"Item":"Bow","Damage":NaN,"Range":Infinity}',)
+            )
+        
+        result = self.service.get_table_data('table_1')
+        self.assertTrue(result.success)
+        self.assertEqual(len(result.data), 2)
+        self.assertEqual(result.data[0]['Item'], 'Bow')
+        self.assertTrue(math.isnan(result.data[0]['Damage']))
+        self.assertEqual(result.data[0]['Range'], float('inf'))
+        self.assertEqual(len(list(self.service.iter_table_rows('table_1'))), 2)
+    
+    def test_store_after_restoring_legacy_backup(self):
+        """Test that a restored pre-content-hash backup is migrated."""
+        backup_path = os.path.join(self.temp_dir, 'legacy.db')
+        create_legacy_backup(backup_path)
+        
+        self.assertTrue(self.service.restore_database(backup_path))
+        self.assertTrue(self.service.store_table(make_table(), self.session_id))
+        self.assertTrue(self.service.store_table(make_table('legacy_1', 'old.html'), self.session_id))
+        self.assertEqual(len(self.service.get_table_data('table_1').data), 2)
+
+    
+    def test_summary_after_restoring_legacy_backup(self):
+        """Test that counters and search work after restoring a pre-stats backup."""
+        backup_path = os.path.join(self.temp_dir, 'legacy.db')
+        create_legacy_backup(backup_path)
+        
+        self.assertTrue(self.service.restore_database(backup_path))
+        summary = self.service.get_database_summary()
+        self.assertEqual(summary['total_tables'], 1)
+        self.assertEqual(summary['total_rows'], 1)
+        self.assertEqual(summary['total_sessions'], 1)
+        self.assertEqual(summary['unique_source_files'], 1)
+        
+        # Counter triggers are in place again
+        self.assertTrue(self.service.store_table(make_table(), self.session_id))
+        self.service.create_session('page.html')
+        summary = self.service.get_database_summary()
+        self.assertEqual(summary['total_tables'], 2)
+        self.assertEqual(summary['total_sessions'], 2)
+        self.assertEqual(summary['unique_source_files'], 2)
+        
+        # Restored rows are in the search index
+        self.assertEqual([t.table_id for t in self.service.search_tables('Hostile')], ['legacy_1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
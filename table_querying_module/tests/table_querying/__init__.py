@@ -0,0 +1 @@
+"""Tests for table_querying package."""
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""Tests for configuration loading."""
+
+import unittest
+from unittest import mock
+import tempfile
+import shutil
+import json
+import os
+
+from src.table_querying.config import TableProcessingConfig, load_config_from_env
+
+
+class TestLoadConfigFromEnv(unittest.TestCase):
+    """Test cases for load_config_from_env."""
+    
+    def test_specific_key_wins_over_generic(self):
+        """Test that OPENAI_API_KEY takes precedence over API_KEY."""
+        with mock.patch.dict(os.environ, {'OPENAI_API_KEY': 'openai-key', 'API_KEY': 'generic-key'}):
+            self.assertEqual(load_config_from_env()['api_key'], 'openai-key')
+        
+        with mock.patch.dict(os.environ, {'API_KEY': 'generic-key'}):
+            os.environ.pop('OPENAI_API_KEY', None)
+            self.assertEqual(load_config_from_env()['api_key'], 'generic-key')
+    
+    def test_environment_changes_are_seen(self):
+        """Test that memoization does not hide later changes to the environment."""
+        with mock.patch.dict(os.environ, {'TABLE_MODEL_ID': 'gpt-4'}):
+            self.assertEqual(load_config_from_env()['model_id'], 'gpt-4')
+            os.environ['TABLE_MODEL_ID'] = 'gpt-4o'
+            self.assertEqual(load_config_from_env()['model_id'], 'gpt-4o')
+            del os.environ['TABLE_MODEL_ID']
+            self.assertNotIn('model_id', load_config_from_env())
+    
+    def test_returned_dict_is_a_copy(self):
+        """Test that callers mutating the result do not affect later calls."""
+        with mock.patch.dict(os.environ, {'TABLE_DB_PATH': 'tables.db'}):
+            config = load_config_from_env()
+            config['db_path'] = 'other.db'
+            self.assertEqual(load_config_from_env()['db_path'], 'tables.db')
+
+
+class TestConfigFromFile(unittest.TestCase):
+    """Test cases for TableProcessingConfig.from_file."""
+    
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, 'config.json')
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _write(self, path, model_id):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'model_id': model_id}, f)
+    
+    def test_reloads_after_modification(self):
+        """Test that an edited file (new mtime, same size) is re-read."""
+        self._write(self.config_path, 'model-a')
+        self.assertEqual(TableProcessingConfig.from_file(self.config_path).model_id, 'model-a')
+        
+        stat = os.stat(self.config_path)
+        self._write(self.config_path, 'model-b')
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(TableProcessingConfig.from_file(self.config_path).model_id, 'model-b')
+    
+    def test_reloads_after_atomic_replace(self):
+        """Test that a file replaced with the same size and mtime is re-read via its inode."""
+        self._write(self.config_path, 'model-a')
+        self.assertEqual(TableProcessingConfig.from_file(self.config_path).model_id, 'model-a')
+        stat = os.stat(self.config_path)
+        
+        replacement = os.path.join(self.temp_dir, 'config.json.tmp')
+        self._write(replacement, 'model-b')
+        os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        # Keep the old file alive so the new one cannot reuse its inode
+        kept = os.path.join(self.temp_dir, 'config.json.old')
+        os.link(self.config_path, kept)
+        os.replace(replacement, self.config_path)
+        
+        self.assertEqual(TableProcessingConfig.from_file(self.config_path).model_id, 'model-b')
+    
+    def test_env_references_expanded_per_load(self):
+        """Test that ${VAR} references use the environment at load time."""
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump({'model_id': '${TEST_CONFIG_MODEL}'}, f)
+        
+        with mock.patch.dict(os.environ, {'TEST_CONFIG_MODEL': 'model-a'}):
+            self.assertEqual(TableProcessingConfig.from_file(self.config_path).model_id, 'model-a')
+        with mock.patch.dict(os.environ, {'TEST_CONFIG_MODEL': 'model-b'}):
+            self.assertEqual(TableProcessingConfig.from_file(self.config_path).model_id, 'model-b')
+    
+    def test_missing_file(self):
+        """Test that a missing file raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            TableProcessingConfig.from_file(os.path.join(self.temp_dir, 'missing.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
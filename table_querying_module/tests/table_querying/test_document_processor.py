@@ -0,0 +1,56 @@
+"""Tests for the document processor."""
+
+import unittest
+
+from src.table_querying.document_processor import DocumentProcessor
+
+
+class TestExtractTableReferences(unittest.TestCase):
+    """Test cases for DocumentProcessor.extract_table_references."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.processor = DocumentProcessor()
+    
+    def _refs(self, content):
+        return [(ref['table_id'], ref['description']) for ref in self.processor.extract_table_references(content)]
+    
+    def test_description_ends_at_blank_line(self):
+        """Test that a description stops at the next paragraph."""
+        content = "Intro\n\n**Table 1 Summary:** Sword stats.\nSecond line\n\nFollowing paragraph"
+        self.assertEqual(self._refs(content), [(1, "Sword stats.\nSecond line")])
+    
+    def test_description_ends_at_next_header(self):
+        """Test adjacent summaries and a summary at the end of the content."""
+        content = "**Table 1 Summary:** first **Table 2 Summary:** second  "
+        self.assertEqual(self._refs(content), [(1, "first"), (2, "second")])
+    
+    def test_positions_and_length(self):
+        """Test the reported span and description length."""
+        content = "x\n\n**Table 12 Summary:** Mobs\n\ny"
+        ref = self.processor.extract_table_references(content)[0]
+        
+        self.assertEqual(content[ref['start_position']:ref['end_position']], "**Table 12 Summary:** Mobs")
+        self.assertEqual(ref['length'], len("Mobs"))
+    
+    def test_round_trip_with_replacement(self):
+        """Test that replaced tables are found again in the processed document."""
+        chunks = ["# Page", "| a | b |", "text", "| c |"]
+        descriptions = [
+            {'status': 'success', 'table_id': 1, 'description': ' Weapons '},
+            {'status': 'success', 'table_id': 2, 'description': 'Armor'}
+        ]
+        modified, info = self.processor.replace_tables_with_descriptions(chunks, [1, 3], descriptions)
+        
+        self.assertEqual(info['successful_replacements'], 2)
+        self.assertEqual(self._refs("\n\n".join(modified)), [(1, "Weapons"), (2, "Armor")])
+    
+    def test_no_references(self):
+        """Test content without summaries, or with a header but no description."""
+        self.assertEqual(self._refs(""), [])
+        self.assertEqual(self._refs("plain text **Table 1 Summary:** "), [])
+        self.assertEqual(self._refs("**Table x Summary:** not numbered"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()